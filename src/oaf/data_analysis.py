@@ -1,7 +1,9 @@
 import networkx as nx
+import numpy as np
 from collections import defaultdict
 from itertools import combinations
 from math import floor
+from operator import itemgetter
 
 from oaf.util import validate_check_data, validate_wave_data, split_data_by_wave
 
@@ -21,7 +23,7 @@ def time_to_failure(wave_data: list[dict], nodes: list[str], start_time: float=N
     time_to_failure = {node: [] for node in nodes}
 
     # Sort wave data by wave number
-    wave_data.sort(key=lambda x: x['wave'])
+    wave_data.sort(key=itemgetter('wave'))
 
     # Discard the first items in wave_data until the first timed_trigger=True entry
     while wave_data and not wave_data[0]['timed_trigger']:
@@ -59,13 +61,13 @@ def time_to_failure_base(wave_data: list[dict], graph: nx.DiGraph):
 
     # Sort wave data by wave number
     # TODO: consodlidate all `sort` and `sorted` calls. This is messy.
-    wave_data.sort(key=lambda x: x['wave'])
+    wave_data.sort(key=itemgetter('wave'))
 
     # Set up time_of_last_failure for each node. Default value is the beginning of the time period where everything is
     #   assumed to be newly calibrated.
     time_of_last_failure = {node: wave_data[0]['wave'] for node in graph.nodes}
 
-    split_wave_data = split_data_by_wave(wave_data)
+    split_wave_data = split_data_by_wave(wave_data, already_validated=True)
 
     # Iterate through each wave, finding the time to base failure for each node
     for wave in split_wave_data:
@@ -85,16 +87,27 @@ def time_to_failure_base(wave_data: list[dict], graph: nx.DiGraph):
     return time_to_base_failure
 
 
-def count_failures(wave_data: list[dict], nodes: list[str]):
+def count_failures(wave_data: list[dict], nodes: list[str], as_array=False):
     """
     Count the number of failures per node using the wave data.
     This is intended for any time period in the wave data, to be used for SPA to find a CI for the number of failures in
     a given time period.
 
     :param wave_data: Raw per-wave simulation data.
+    :param as_array: Return the counts as an int64 array in the order of `nodes` instead of a dict.
     :return: The number of failures per node.
     """
     validate_wave_data(wave_data)
+    if as_array:
+        node_index = {node: i for i, node in enumerate(nodes)}
+        counts = np.zeros(len(node_index), dtype=np.int64)
+        for entry in wave_data:
+            if entry['timed_trigger']:
+                continue
+            for node in entry['root_nodes']:
+                counts[node_index[node]] += 1
+        return counts
+
     node_failure_counts = {node: 0 for entry in wave_data for node in nodes}
 
     for entry in wave_data:
@@ -106,7 +119,7 @@ def count_failures(wave_data: list[dict], nodes: list[str]):
     return node_failure_counts
 
 
-def count_base_failures(wave_data: list[dict], graph:nx.DiGraph):
+def count_base_failures(wave_data: list[dict], graph:nx.DiGraph, as_array=False):
     """
     Count the number of base failures per node using the wave data.
     This is intended for any time period in the wave data, to be used for SPA to find a CI for the number of base
@@ -114,22 +127,30 @@ def count_base_failures(wave_data: list[dict], graph:nx.DiGraph):
 
     :param wave_data: Raw per-wave simulation data.
     :param graph: The graph representing node relationships.
+    :param as_array: Return the counts as an int64 array in the order of `graph.nodes` instead of a dict.
     :return: The number of base failures per node.
     """
     validate_wave_data(wave_data)
-    base_failure_counts = {node: 0 for entry in wave_data for node in graph.nodes}
+    if as_array:
+        node_index = {node: i for i, node in enumerate(graph.nodes)}
+        counts = np.zeros(len(node_index), dtype=np.int64)
+    else:
+        base_failure_counts = {node: 0 for entry in wave_data for node in graph.nodes}
 
-    split_wave_data = split_data_by_wave(wave_data)
+    split_wave_data = split_data_by_wave(wave_data, already_validated=True)
 
     for wave in split_wave_data:
         # Get base failure causes for each case
         base_failures = find_base_failure_for_wave(wave, graph)
         flat_base_failures = [item for sublist in base_failures.values() for item in sublist]
         base_failure_nodes = set(flat_base_failures)
+        if as_array:
+            counts[[node_index[node] for node in base_failure_nodes]] += 1
+            continue
         for node in base_failure_nodes:
             base_failure_counts[node] += 1
 
-    return base_failure_counts
+    return counts if as_array else base_failure_counts
 
 
 def find_co_occurring_failures(wave_data, nodes):
@@ -141,7 +162,7 @@ def find_co_occurring_failures(wave_data, nodes):
     """
     validate_wave_data(wave_data)
 
-    split_wave_data = split_data_by_wave(wave_data)
+    split_wave_data = split_data_by_wave(wave_data, already_validated=True)
 
     cooccurrence_matrix = {}
     # Add all node combinations to the matrix
@@ -177,7 +198,7 @@ def find_co_occurring_failures_sliding(wave_data, nodes, sliding_window_size):
     """
     validate_wave_data(wave_data)
 
-    split_wave_data = split_data_by_wave(wave_data)
+    split_wave_data = split_data_by_wave(wave_data, already_validated=True)
 
     cooccurrence_matrix = {}
     # Add all node combinations to the matrix
@@ -293,7 +314,7 @@ def find_base_failures(wave_data, graph):
     :return: dict: A dictionary where keys are downstream nodes and values are lists of base causes.
     """
     validate_wave_data(wave_data)
-    split_wave_data = split_data_by_wave(wave_data)
+    split_wave_data = split_data_by_wave(wave_data, already_validated=True)
 
     base_failure_stats = defaultdict(lambda: defaultdict(int))
 
@@ -1,4 +1,5 @@
-from oaf.optimus_simulator.node import Node
+from concurrent.futures import ThreadPoolExecutor
+from oaf.optimus_simulator.node import Node, simulate_failure_parallel
 
 # TODO: Timeout is currently not used. Implement timeout functionality
 class QuantumCalibrationSimulator:
@@ -8,7 +9,7 @@ class QuantumCalibrationSimulator:
     Optimus algorithm to diagnose and recalibrate the nodes. The output of the simulation is the same as from
     a real quantum device.
     """
-    def __init__(self, graph, nodes, root_nodes, time_step=1, timeout=10):
+    def __init__(self, graph, nodes, root_nodes, time_step=1, timeout=10, executor=None):
         """
         Initialize the simulator.
 
@@ -17,9 +18,12 @@ class QuantumCalibrationSimulator:
         :param root_nodes: The root nodes for recursive DFS.
         :param time_step: The simulation step size.
         :param timeout: Number of time units before triggering timeout for nodes.
+        :param executor: Optional concurrent.futures.ThreadPoolExecutor used to advance the nodes in parallel at each
+            step. Thread pool only, since the nodes are advanced in place.
         """
         assert isinstance(time_step, int) and time_step > 0
         assert isinstance(timeout, int) and timeout > 0
+        assert executor is None or isinstance(executor, ThreadPoolExecutor)
         assert set(graph.nodes) == set(nodes.keys())
         for n in nodes.keys():
             assert n in graph.nodes
@@ -29,9 +33,19 @@ class QuantumCalibrationSimulator:
         self.root_nodes = root_nodes
         self.time_step = time_step
         self.timeout = timeout
+        self.executor = executor
         self.wave_data = []  # Stores the simulation data (waves, root_nodes, submitted_nodes)
         self.check_data_results = []
         self.nodes = nodes
+        # Node arrays (e.g. SimpleNodeArray) that some of the nodes belong to. These are advanced as a whole
+        self.node_arrays = list({
+            id(node_array): node_array
+            for node_array in (getattr(node, 'node_array', None) for node in nodes.values())
+            if node_array is not None
+        }.values())
+        # Nodes that read other nodes' state must see it after every single step, so only nodes without any
+        #   dependent_nodes are advanced through a whole time step in one call
+        self.batch_time_step = not any(node.dependent_nodes for node in nodes.values())
         self.wave_offset = 0  # Global offset to avoid workarounds for diagnosis wave separation
         self.current_time = 0.
         self.ground_truth = []
@@ -246,11 +260,22 @@ class QuantumCalibrationSimulator:
         return wave_data, check_data_results
 
     def _simulate_failures(self, current_time):
-        """Simulate failures for each node based on their failure probability."""
-        # Simulate failure for each time step
+        """
+        Simulate failures for each node based on their failure probability. Without cross-node dependencies, every
+        node is advanced through all steps of the time step at once, so all its drifts happen before its single
+        failure check. Otherwise all nodes are advanced one step at a time, and each step sees its dependencies'
+        state after the previous step.
+        """
+        if self.batch_time_step:
+            for node_array in self.node_arrays:
+                node_array.step(self.time_step)
+            simulate_failure_parallel(self.nodes.values(), current_time, executor=self.executor, steps=self.time_step)
+            return
+
         for step in range(self.time_step):
-            for _, node in self.nodes.items():
-                node.simulate_failure(current_time + step)
+            for node_array in self.node_arrays:
+                node_array.step(1)
+            simulate_failure_parallel(self.nodes.values(), current_time + step, executor=self.executor)
 
     def get_wave_data(self):
         """Get the wave data."""
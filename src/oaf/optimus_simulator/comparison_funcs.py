@@ -8,6 +8,10 @@ def mean_greater_than(data, threshold):
     return np.mean(data) > threshold
 
 
+def any_greater_than(data, threshold):
+    return (data > threshold).any()
+
+
 # SPA Comparison Functions
 def create_spa_greater_than(proportion, confidence):
     smc_direction = '>'
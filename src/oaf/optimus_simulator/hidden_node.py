@@ -7,10 +7,11 @@ class HiddenNode(FuncNode):
     such as temporary voltage noise or ambient temperature fluctuations.
     """
 
-    def simulate_failure(self, time=None):
+    def simulate_failure(self, time=None, steps=1):
         # Override the simulate_failure method to only drift parameters
         # Used every step of the simulation, simulate drift
-        self.drift_parameters()
+        for _ in range(steps):
+            self.drift_parameters()
 
     def check_data(self, _):
         # Hidden nodes are never failures
@@ -54,7 +55,7 @@ class OneParamHiddenNode(HiddenNode):
         }
 
     def get_param(self):
-        return np.floor(self.current_params['param'])
+        return np.floor(self._cur[0])
 
 
 class CompensatingExpDecayNode(ExpDecayFuncNode):
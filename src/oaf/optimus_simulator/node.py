@@ -1,9 +1,84 @@
+import math
 import ms_gate
-import random
 import numpy as np
 import qutip as qt
-from abc import ABC
-from scipy.stats import gamma
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from oaf.util import njit
+
+# -log(1 - .999): multiple of the decay time at which an exponential decay has decayed by 99.9%
+_NEG_LOG_999_REMAINDER = -math.log(1 - .999)
+
+# Random generator shared by all nodes that are not given their own `seed`. Reseed with `seed_rng`
+_RNG = np.random.default_rng()
+
+# Number of uniform draws each node pre-draws from its random generator at a time
+_RAND_BUFFER_SIZE = 4096
+
+# Computational basis kets and the ideal |-> state, (|1> - |0>) / sqrt(2), as plain arrays
+_KET_0 = np.array([1., 0.], dtype=np.complex128)
+_KET_1 = np.array([0., 1.], dtype=np.complex128)
+_MINUS_KET = (_KET_1 - _KET_0) / np.sqrt(2)
+_RHO_MINUS = np.outer(_MINUS_KET, _MINUS_KET.conj())
+# |-> as a Qobj for ms_gate, built once instead of on every simulation
+_MINUS_KET_QOBJ = qt.Qobj(_MINUS_KET.reshape(2, 1))
+
+
+def _minus_state_fidelity(state):
+    """
+    Fidelity of a qubit state (ket or density matrix Qobj) with the ideal |-> state. Same value as qt.fidelity:
+    F = Tr( sqrt( sqrt(rho_ideal) * rho_actual * sqrt(rho_ideal) ) ),
+    which reduces to sqrt( Tr(rho_ideal * rho_actual) ) because rho_ideal is pure.
+    """
+    arr = state.full()
+    if state.isoper:
+        overlap = np.real(np.trace(_RHO_MINUS @ arr))
+    else:
+        # Tr(|-><-| |psi><psi|) = |<-|psi>|^2
+        overlap = abs(np.vdot(_MINUS_KET, arr.ravel())) ** 2
+    return math.sqrt(max(overlap, 0.))
+
+
+def _read_only_array(values):
+    """Array constant shared between instances. Made read-only so that it cannot be modified through one of them"""
+    arr = np.array(values)
+    arr.flags.writeable = False
+    return arr
+
+
+@njit(cache=True, fastmath=True)
+def _sin2_with_error(omega, time, cos2_delta, background):
+    """sin^2(omega * time) * cos^2(delta) - background, with cos^2(delta) precomputed"""
+    s = math.sin(omega * time)
+    return s * s * cos2_delta - background
+
+
+@njit(cache=True)
+def _drift_in_place(params, rates, biases, mins, maxs, draws, coeff):
+    """
+    Drift `params` in place. `draws` holds 2 * len(params) uniform draws: the first half picks each parameter's drift
+    direction (+1 with probability `biases[i]`), the second half scales its step. Results are clipped to [mins, maxs].
+    """
+    n = len(params)
+    for i in range(n):
+        direction = 1. if draws[i] < biases[i] else -1.
+        value = params[i] + direction * rates[i] * draws[n + i] * coeff
+        params[i] = min(max(value, mins[i]), maxs[i])
+
+
+@njit(cache=True, fastmath=True)
+def _x_gate_fidelity_analytic(omega, time, spin_phase):
+    """
+    Fidelity with |-> after a resonant carrier pulse on |->, for an ideal two-level system. The pulse rotates the Bloch
+    vector by theta = 2 * omega * time (the same pi-pulse convention as the sin^2(omega * time) Rabi model) about the
+    axis (cos(spin_phase), sin(spin_phase), 0). The overlap is |<-|U|->|^2 = cos^2(phi) + sin^2(phi) * cos^2(theta / 2),
+    and the square root is taken to match qt.fidelity.
+    """
+    s_phi = math.sin(spin_phase)
+    s_half = math.sin(omega * time)
+    return math.sqrt(1. - s_phi * s_phi * s_half * s_half)
 
 
 class Node(ABC):
@@ -18,7 +93,8 @@ class Node(ABC):
 
         self.name = kwargs['name']
         self.base_timeout = kwargs['timeout']
-        self.timeout = kwargs['timeout'] + kwargs.get('timeout_offset', 0.)
+        self.timeout_offset = kwargs.get('timeout_offset', 0.)
+        self.timeout = self.base_timeout + self.timeout_offset
         self.monitor_in_spec = kwargs.get('monitor_in_spec', True)
         self.failed = False
         self.last_calibration = 0.
@@ -27,31 +103,31 @@ class Node(ABC):
         self.check_data_value = None
         self.num_first_checks_to_delay = 2
         self.cur_num_first_checks_delayed = 0
+        # Returned by get_check_data, updated in place on every call
+        self._check_result = {'data': None, 'failure_magnitude': 0}
 
         # Flags for timeout-aware adaptive Optimus
         self.long_lived_flag = False
 
+        # Random generator: the shared module generator, or a private one if the node is given a `seed`. Uniform draws
+        #   are taken from a pre-drawn buffer, see `_next_rand`. The buffer is only drawn on first use, so nodes that
+        #   never draw (e.g. nodes advanced by a node array) do not hold one
+        self._rng = _RNG if kwargs.get('seed') is None else np.random.default_rng(kwargs['seed'])
+        self._rand_buf = None
+        self._rand_idx = _RAND_BUFFER_SIZE
+
         # For connecting to dependent nodes
-        if 'dependent_nodes' in kwargs:
-            self.dependent_nodes = kwargs['dependent_nodes']
-        else:
-            self.dependent_nodes = {}
+        self.dependent_nodes = kwargs.get('dependent_nodes', {})
 
-        if 'delay_first_check' in kwargs:
-            assert isinstance(kwargs['delay_first_check'], bool)
-            self.delay_first_check = kwargs['delay_first_check']
-        else:
-            self.delay_first_check = False
+        self.delay_first_check = kwargs.get('delay_first_check', False)
+        assert isinstance(self.delay_first_check, bool)
 
         if self.delay_first_check:
             assert 'fifth_percentile_ttf' in kwargs
             self.fifth_percentile_ttf = kwargs['fifth_percentile_ttf']
 
-        if 'check_long_lived_nodes' in kwargs:
-            assert isinstance(kwargs['check_long_lived_nodes'], bool)
-            self.check_long_lived_nodes = kwargs['check_long_lived_nodes']
-        else:
-            self.check_long_lived_nodes = False
+        self.check_long_lived_nodes = kwargs.get('check_long_lived_nodes', False)
+        assert isinstance(self.check_long_lived_nodes, bool)
 
         if self.check_long_lived_nodes:
             assert 'ninety_fifth_percentile_ttf' in kwargs
@@ -63,16 +139,36 @@ class Node(ABC):
     def reset_to_initial_timeout(self):
         self.timeout = self.base_timeout
 
-    def simulate_failure(self, time=None):
-        """Simulate failure for the node. Typically done at every timestep of the sim."""
+    def _next_rand(self, n):
+        """
+        Get the next `n` uniform [0, 1) draws from the node's buffer, refilling the buffer when exhausted.
+        The returned array is a view into the buffer and is only valid until the next call.
+        """
+        if self._rand_idx + n > _RAND_BUFFER_SIZE:
+            if self._rand_buf is None:
+                self._rand_buf = self._rng.random(_RAND_BUFFER_SIZE)
+            else:
+                self._rng.random(out=self._rand_buf)
+            self._rand_idx = 0
+        draws = self._rand_buf[self._rand_idx:self._rand_idx + n]
+        self._rand_idx += n
+        return draws
+
+    def simulate_failure(self, time=None, steps=1):
+        """
+        Simulate failure for the node. Typically done at every timestep of the sim.
+        `steps` advances the node by that many timesteps in a single call.
+        """
         pass
 
     def get_check_data(self):
-        """Get the most recent check data for the node"""
-        return {
-            'data': self.check_data_value,
-            'failure_magnitude': self.failure_magnitude
-        }
+        """
+        Get the most recent check data for the node. The same dict is updated and returned on every call, so copy it
+        to keep a snapshot.
+        """
+        self._check_result['data'] = self.check_data_value
+        self._check_result['failure_magnitude'] = self.failure_magnitude
+        return self._check_result
 
     def get_all_data(self):
         """Reserved function to get all data from the node"""
@@ -81,13 +177,12 @@ class Node(ABC):
     def check_data(self, time):
         failed = self.failed
 
-        # TODO: implement this correctly
-        # # If the node is long-lived, check if the 95th percentile ttf is greater than the current wait time value
-        # if self.check_long_lived_nodes and not self.long_lived_flag:
-        #     time_alive = self.last_calibration - time
-        #     if time_alive > self.ninety_fifth_percentile_ttf:
-        #         self.timeout = self.base_timeout / 2
-        #         self.long_lived_flag = True
+        # If the node has outlived its 95th percentile ttf since the last calibration, check it more often.
+        # The simulator stamps last_check before calling check_data, so time alive is measured from the calibration
+        if self.check_long_lived_nodes and not self.long_lived_flag:
+            if time - self.last_calibration > self.ninety_fifth_percentile_ttf:
+                self.timeout = self.base_timeout / 2
+                self.long_lived_flag = True
 
         if self.delay_first_check and self.cur_num_first_checks_delayed < self.num_first_checks_to_delay:
             self.cur_num_first_checks_delayed += 1
@@ -107,7 +202,10 @@ class Node(ABC):
         # Reset the number of delayed checks, if applicable
         self.cur_num_first_checks_delayed = 0
 
-        self.long_lived_flag = False
+        # Undo the long-lived timeout reduction now that the node is freshly calibrated, keeping the node's offset
+        if self.long_lived_flag:
+            self.timeout = self.base_timeout + self.timeout_offset
+            self.long_lived_flag = False
 
         # Perform adaptive Optimus timeout adjustment
         if self.delay_first_check and self.fifth_percentile_ttf > 3 * self.timeout:
@@ -125,33 +223,45 @@ class SimpleNode(Node):
         assert 'failure_prob' in kwargs
         self.failure_prob = kwargs['failure_prob']
 
-    def simulate_failure(self, time=None):
-        if self.failed:
-            return
+    def simulate_failure(self, time=None, steps=1):
+        for _ in range(steps):
+            if self.failed:
+                return
 
-        self.check_data_value = random.random()
-        self.failed = self.check_data_value < self.failure_prob
-        # Create a random integer (0 to 2) to simulate the magnitude of the failure
-        if self.failed:
-            self.failure_magnitude = random.randint(1, 2)
+            self.check_data_value = self._next_rand(1).item()
+            self.failed = self.check_data_value < self.failure_prob
+            # Create a random integer (1 or 2) to simulate the magnitude of the failure
+            if self.failed:
+                self.failure_magnitude = 1 + int(2 * self._next_rand(1).item())
 
 
 class DistributionThresholdNode(Node):
     """
     Node that at every step of the simulation will generate `num_samples` data points from a distribution
-    and check if the samples satisfy some property
+    and check if the samples satisfy some property.
+    `comparison_func(samples, threshold) -> bool` is given the samples as a NumPy array, which is reused between steps
+    and must not be kept by the function.
+    Constructing a DistributionThresholdNode returns the subclass for `dist_type`, e.g. NormalThresholdNode.
     """
 
+    def __new__(cls, *args, **kwargs):
+        # Dispatch to the subclass for the distribution, so that the draw is resolved once at construction
+        if cls is DistributionThresholdNode:
+            assert 'dist_type' in kwargs, "'dist_type' is required for DistributionMeanThresholdNode."
+            dist_type = kwargs['dist_type']
+            if dist_type not in _DISTRIBUTION_NODES:
+                raise ValueError(f"Invalid distribution type: {dist_type}")
+            cls = _DISTRIBUTION_NODES[dist_type]
+        return super().__new__(cls)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        assert 'dist_type' in kwargs, "'dist_type' is required for DistributionMeanThresholdNode."
         assert 'dist_mean' in kwargs, "'dist_mean' is required for DistributionMeanNode."
         assert 'dist_std' in kwargs, "'dist_std' is required for DistributionMeanNode."
         assert 'num_samples' in kwargs, "'num_samples' is required for DistributionMeanNode."
         assert 'threshold' in kwargs, "'threshold' is required for DistributionMeanNode."
         assert 'comparison_func' in kwargs, "'comparison_func' is required for DistributionMeanNode."
 
-        dist_type = kwargs['dist_type']
         self.dist_mean = kwargs['dist_mean']
         self.dist_std = kwargs['dist_std']
         self.num_samples = kwargs['num_samples']
@@ -159,33 +269,88 @@ class DistributionThresholdNode(Node):
         self.comparison_func = kwargs['comparison_func']
         self.check_data_value = []
         self.metadata = {'dist_mean': self.dist_mean, 'dist_std': self.dist_std, 'num_samples': self.num_samples}
-        # Select the distribution function
-        if dist_type == 'normal':
-            self.dist_func = np.random.normal
-        elif dist_type == 'uniform':
-            self.dist_func = np.random.uniform
-        elif dist_type == 'poisson':
-            self.dist_func = np.random.poisson
-        elif dist_type == 'exponential':
-            self.dist_func = np.random.exponential
-        elif dist_type == 'gamma':
-            self.dist_func = np.random.gamma
-        else:
-            raise ValueError(f"Invalid distribution type: {dist_type}")
+        # Samples are drawn into this buffer in place every step
+        self._buf = np.empty(self.num_samples)
+
+    @abstractmethod
+    def _draw(self):
+        """Draw `num_samples` samples, into `self._buf` where the distribution allows it"""
+
+    def simulate_failure(self, time=None, steps=1):
+        for _ in range(steps):
+            if self.failed:
+                return
+
+            # Generate random data
+            self.check_data_value = self._draw()
+
+            # Use the comparison function to determine if the node failed
+            self.failed = self.comparison_func(self.check_data_value, self.threshold)
+
+            # Check failure magnitude
+            if self.failed:
+                self.failure_magnitude = 1
+
+    def get_check_data(self):
+        """Get the most recent check data for the node. The samples are copied out of the reused buffer"""
+        check_result = super().get_check_data()
+        check_result['data'] = np.array(self.check_data_value)
+        return check_result
+
+
+class NormalThresholdNode(DistributionThresholdNode):
+    """Normal distribution with mean `dist_mean` and standard deviation `dist_std`"""
+
+    def _draw(self):
+        self._rng.standard_normal(out=self._buf)
+        self._buf *= self.dist_std
+        self._buf += self.dist_mean
+        return self._buf
+
+
+class UniformThresholdNode(DistributionThresholdNode):
+    """Uniform distribution on [dist_mean, dist_std)"""
 
-    def simulate_failure(self, time=None):
-        if self.failed:
-            return
+    def _draw(self):
+        self._rng.random(out=self._buf)
+        self._buf *= self.dist_std - self.dist_mean
+        self._buf += self.dist_mean
+        return self._buf
 
-        # Generate random data
-        self.check_data_value = self.dist_func(self.dist_mean, self.dist_std, self.num_samples)
 
-        # Use the comparison function to determine if the node failed
-        self.failed = self.comparison_func(list(self.check_data_value), self.threshold)
+class PoissonThresholdNode(DistributionThresholdNode):
+    """Poisson distribution with rate `dist_mean`. `dist_std` is unused"""
 
-        # Check failure magnitude
-        if self.failed:
-            self.failure_magnitude = 1
+    def _draw(self):
+        # Generator.poisson has no `out`, so this allocates
+        return self._rng.poisson(self.dist_mean, self.num_samples)
+
+
+class ExponentialThresholdNode(DistributionThresholdNode):
+    """Exponential distribution with scale (mean) `dist_mean`. `dist_std` is unused"""
+
+    def _draw(self):
+        self._rng.standard_exponential(out=self._buf)
+        self._buf *= self.dist_mean
+        return self._buf
+
+
+class GammaThresholdNode(DistributionThresholdNode):
+    """Gamma distribution with shape `dist_mean` and scale `dist_std`"""
+
+    def _draw(self):
+        self._rng.standard_gamma(self.dist_mean, out=self._buf)
+        self._buf *= self.dist_std
+        return self._buf
+
+
+_DISTRIBUTION_NODES = {
+    'normal': NormalThresholdNode,
+    'uniform': UniformThresholdNode,
+    'poisson': PoissonThresholdNode,
+    'exponential': ExponentialThresholdNode,
+    'gamma': GammaThresholdNode,
+}
 
 
 class TrendNode(Node):
@@ -206,24 +371,40 @@ class TrendNode(Node):
         self.noise_std = kwargs['noise_std']
         self.threshold = kwargs['threshold']
 
-    def simulate_failure(self, time=None):
-        if self.failed:
-            return
+        # Standard normal draws for the noise, pre-drawn in a batch on first use and consumed one per step
+        self._noise_buf = None
+        self._noise_idx = _RAND_BUFFER_SIZE
+
+    def _next_noise(self):
+        if self._noise_idx == _RAND_BUFFER_SIZE:
+            self._noise_buf = self._rng.standard_normal(_RAND_BUFFER_SIZE).tolist()
+            self._noise_idx = 0
+        noise = self._noise_buf[self._noise_idx]
+        self._noise_idx += 1
+        return self.noise_std * noise
+
+    def simulate_failure(self, time=None, steps=1):
+        for _ in range(steps):
+            if self.failed:
+                return
 
-        # Simulate drift and noise
-        drift = self.drift_rate
-        noise = np.random.normal(0, self.noise_std)
-        self.check_data_value += drift + noise
+            # Simulate drift and noise
+            drift = self.drift_rate
+            noise = self._next_noise()
+            self.check_data_value += drift + noise
 
-        # Determine failure
-        self.failed = self.check_data_value > self.threshold
+            # Determine failure
+            self.failed = self.check_data_value > self.threshold
 
-        # Simulate failure magnitude
-        if self.failed:
-            self.failure_magnitude = 1 + int(abs(self.check_data_value - self.threshold) > self.noise_std)
+            # Simulate failure magnitude
+            if self.failed:
+                self.failure_magnitude = 1 + (math.fabs(self.check_data_value - self.threshold) > self.noise_std)
 
 
 class FuncNode(Node, ABC):
+    # Subclasses read the current parameter values by unpacking `self._cur.tolist()`, which is in `self.parameters`
+    #   order, instead of building the `current_params` snapshot.
+
     def __init__(self, **kwargs):
         # If node is not monitored for being in spec, then correctness data is not valid.
         # Set this to off if correctness is not needed, as it greatly speeds up simulation.
@@ -233,9 +414,20 @@ class FuncNode(Node, ABC):
         self.nonlinear_drift = kwargs.get('nonlinear_drift', False)
         self.nonlinear_drift_k = kwargs.get('nonlinear_drift_k', 0.02)
         self.nonlinear_drift_n0 = kwargs.get('nonlinear_drift_n0', 200)
+        # Reuse the last check value while no parameter has moved by more than this fraction of its scale (its
+        #   initial magnitude, or 1 for parameters initialized to 0). Only valid for nodes whose check value depends
+        #   on their own parameters alone (no dependent_nodes). None disables it.
+        self.simulation_skip_tol = kwargs.get('simulation_skip_tol', None)
+        self._last_params_vec = None
+        self._last_check_value = None
 
         super().__init__(**kwargs)
         self.parameter_setup(**kwargs)
+        self._setup_parameter_arrays()
+        # Bound once so the per-step calls skip the method lookup. run_check is only inlined into simulate_failure
+        #   when a subclass has not replaced it.
+        self._check_value_fast = self._check_value
+        self._inline_run_check = type(self).run_check is FuncNode.run_check
         # Used to store parameter values before and after calibration
         self.params_before_calibration = {}
         self.params_after_calibration = {}
@@ -244,7 +436,7 @@ class FuncNode(Node, ABC):
         # Must set up the following:
         #   self.parameters: list of strings
         #   self.initial_params: dict of initial parameter values
-        #   self.current_params: dict of current parameter values
+        #   self.current_params: dict of current parameter values (optional, defaults to a copy of initial_params)
         #   self.threshold: float
         #   self.drift_rates: dict of drift rates
         #   self.drift_biases: dict of drift biases
@@ -252,6 +444,51 @@ class FuncNode(Node, ABC):
         #   self.parameter_max_values: dict of maximum parameter values
         pass
 
+    def _setup_parameter_arrays(self):
+        """
+        Pack the per-parameter dicts from `parameter_setup` into arrays ordered by `self.parameters`. Drift is applied
+        to all parameters at once on these arrays, which hold the current values from then on.
+        """
+        self._param_names = tuple(self.parameters)
+        self._rates = np.array([self.drift_rates[p] for p in self._param_names], dtype=float)
+        self._biases = np.array([self.drift_biases[p] for p in self._param_names], dtype=float)
+        self._mins = np.array([self.parameter_min_values[p] for p in self._param_names], dtype=float)
+        self._maxs = np.array([self.parameter_max_values[p] for p in self._param_names], dtype=float)
+        # Nodes start at their initial parameters. Hidden nodes are never calibrated and only define current_params
+        if not hasattr(self, '_current_params'):
+            self._current_params = self.initial_params.copy()
+        initial_params = getattr(self, 'initial_params', self._current_params)
+        self._init = np.array([initial_params[p] for p in self._param_names], dtype=float)
+        self._cur = np.array([self._current_params[p] for p in self._param_names], dtype=float)
+        # Scale of each parameter for `simulation_skip_tol`
+        self._skip_scale = np.where(self._init != 0., np.abs(self._init), 1.)
+
+    @property
+    def current_params(self):
+        """
+        Read-only snapshot of the current parameter values. Item writes raise a TypeError: use `set_param`, or assign
+        a whole new dict to `current_params`.
+        """
+        # Parameter arrays do not exist yet while running parameter_setup
+        if not hasattr(self, '_cur'):
+            return MappingProxyType(self._current_params)
+        return MappingProxyType(self.params_snapshot())
+
+    @current_params.setter
+    def current_params(self, params):
+        if hasattr(self, '_cur'):
+            self._cur = np.array([params[p] for p in self._param_names], dtype=float)
+        else:
+            self._current_params = params
+
+    def params_snapshot(self):
+        """New dict of the current parameter values, built straight from the parameter array"""
+        return dict(zip(self._param_names, self._cur.tolist()))
+
+    def set_param(self, param, value):
+        """Set a single current parameter value"""
+        self._cur[self._param_names.index(param)] = value
+
     def nonlinear_coeff(self, time_since_calibration):
         """Returns a drift factor that starts at 0 and asymptotically approaches 1"""
         return 1 / (1 + np.exp(-self.nonlinear_drift_k * (time_since_calibration - self.nonlinear_drift_n0)))
@@ -263,17 +500,14 @@ class FuncNode(Node, ABC):
         else:
             nonlinear_coeff = 1
 
-        for param in self.parameters:
-            # Decide drift direction
-            if np.random.uniform() < self.drift_biases[param]:
-                direction = 1
-            else:
-                direction = -1
-            drift = direction * self.drift_rates[param] * np.random.uniform() * nonlinear_coeff
-            # Ensure that the new parameter is between the max and min values
-            new_param = self.current_params[param] + drift
-            new_param = max(self.parameter_min_values[param], new_param)
-            self.current_params[param] = min(self.parameter_max_values[param], new_param)
+        n = len(self._param_names)
+        # One batch of draws per step: the first half picks directions, the second half scales the steps
+        draws = self._next_rand(2 * n)
+        # Decide drift direction for every parameter at once. Branchless: True -> +1, False -> -1
+        direction = 2. * (draws[:n] < self._biases) - 1.
+        drift = direction * self._rates * draws[n:] * nonlinear_coeff
+        # Ensure that the new parameters are between the max and min values
+        self._cur = np.clip(self._cur + drift, self._mins, self._maxs)
 
     def _check_value(self):
         """
@@ -281,16 +515,35 @@ class FuncNode(Node, ABC):
         """
         pass
 
-    def run_check(self):
+    def _check_value_cached(self):
+        """
+        Get `_check_value`, skipping the evaluation if the parameters are within `simulation_skip_tol` of the
+        parameters used for the last evaluation.
+        """
+        if self.simulation_skip_tol is None:
+            return self._check_value_fast()
+
+        if self._last_params_vec is not None:
+            delta = np.max(np.abs(self._cur - self._last_params_vec) / self._skip_scale)
+            if delta <= self.simulation_skip_tol:
+                return self._last_check_value
+
+        value = self._check_value_fast()
+        self._last_params_vec = self._cur.copy()
+        self._last_check_value = value
+        return value
+
+    def run_check(self, value=None):
         """
-        Perform the check evaluate results.
+        Perform the check evaluate results. An already computed check value may be passed in as `value`.
         """
-        value = self._check_value()
+        if value is None:
+            value = self._check_value_cached()
         return value, value > self.threshold
 
     def calibrate(self, time):
         # Save the parameters right before calibration
-        self.params_before_calibration = self.current_params.copy()
+        self.params_before_calibration = self.params_snapshot()
 
         # Reset to initial parameters
         if self.randomize_calibration:
@@ -304,41 +557,50 @@ class FuncNode(Node, ABC):
                 shape = 2.0  # Adjust as needed for desired tail behavior
 
                 if drift_direction:  # Right-tailed gamma (positive drift bias)
-                    new_params[param] = gamma.rvs(a=shape, scale=drift_scale / shape) + optimal_value
+                    new_params[param] = self._rng.gamma(shape, drift_scale / shape) + optimal_value
                 else:  # Left-tailed gamma (negative drift bias)
-                    new_params[param] = optimal_value - gamma.rvs(a=shape, scale=drift_scale / shape)
+                    new_params[param] = optimal_value - self._rng.gamma(shape, drift_scale / shape)
             self.current_params = new_params
+            self.params_after_calibration = new_params.copy()
         else:
-            self.current_params = self.initial_params.copy()
-
-        self.params_after_calibration = self.current_params.copy()
+            # Reset in place from the initial parameter array
+            self._cur[:] = self._init
+            self.params_after_calibration = self.initial_params.copy()
 
         # Calibrate the time
         super().calibrate(time)
 
-    def _check_failure_magnitude(self):
+    def _check_failure_magnitude(self, value=None):
         """
-        Check failure magnitude based on how close the value is to the threshold.
+        Check failure magnitude based on how close the value is to the threshold. An already computed check value may
+        be passed in as `value`.
         """
         # TODO: This assumes that the value falls below the threshold.
         #   Create an option to have a topline bound as well.
-        value = self._check_value()
-        if self.threshold - value < 0.:
-            return 0
-        if self.threshold - value < 0.01:
-            return 1
-        else:
-            return 2
-
-    def simulate_failure(self, time=None):
+        if value is None:
+            value = self._check_value_cached()
+        # 0 above the threshold, 1 within 0.01 below it, 2 further below
+        diff = self.threshold - value
+        # int() so that NumPy check values still give the int that validate_check_data expects
+        return int((diff >= 0.) * (1 + (diff >= 0.01)))
+
+    def simulate_failure(self, time=None, steps=1):
         # Used every step of the simulation, therefore must include drift
         # Simulate drift
-        self.drift_parameters(time)
+        for step in range(steps):
+            self.drift_parameters(None if time is None else time + step)
 
+        # Failure is re-evaluated from the parameters at every step, so when advancing several steps at once only the
+        #   final parameters need to be checked. This avoids running the (possibly expensive) check for every step.
         if self.monitor_in_spec:
-            self.check_data_value, result = self.run_check()
-            self.failed = not result
-        # self.failure_magnitude = self._check_failure_magnitude()
+            if self._inline_run_check:
+                value = self._check_value_cached()
+                self.check_data_value = value
+                self.failed = not value > self.threshold
+            else:
+                self.check_data_value, result = self.run_check()
+                self.failed = not result
+        # self.failure_magnitude = self._check_failure_magnitude(self.check_data_value)
 
     def get_parameter_calibration_data(self):
         return self.params_before_calibration, self.params_after_calibration
@@ -351,6 +613,10 @@ class FuncNode(Node, ABC):
 
 class Sin2FuncNode(FuncNode):
 
+    # cos^2(delta) for the last delta seen. delta often does not drift, so this is reused across steps
+    _cached_delta = None
+    _cached_cos2_delta = 1.
+
     def parameter_setup(self, **kwargs):
         # Default values
         defaults = {
@@ -389,8 +655,6 @@ class Sin2FuncNode(FuncNode):
             'delta': self.delta,
             'background': self.background
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'omega': self.omega_drift_rate,
             'time': self.time_drift_rate,
@@ -418,11 +682,14 @@ class Sin2FuncNode(FuncNode):
         }
 
     def sin2_with_error(self):
-        omega = self.current_params['omega']
-        time = self.current_params['time']
-        delta = self.current_params['delta']
-        background = self.current_params['background']
-        return np.sin(omega * time) ** 2 * np.cos(delta) ** 2 - background
+        omega, time, delta, background = self._cur.tolist()
+        return _sin2_with_error(omega, time, self._cos2_delta(delta), background)
+
+    def _cos2_delta(self, delta):
+        if delta != self._cached_delta:
+            self._cached_delta = delta
+            self._cached_cos2_delta = math.cos(delta) ** 2
+        return self._cached_cos2_delta
 
     def _check_value(self):
         """
@@ -459,7 +726,7 @@ class ExpDecayFuncNode(FuncNode):
             setattr(self, key, kwargs.get(key, default))
 
         # Calculate the time parameter based on the decay time. Drifts in time here model drifts in the control
-        self.time = -self.decay_time * np.log(1 - .999)
+        self.time = self.decay_time * _NEG_LOG_999_REMAINDER
 
         self.parameters = [
             'amp',
@@ -473,8 +740,6 @@ class ExpDecayFuncNode(FuncNode):
             'decay_time': self.decay_time,
             'background': self.background,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'amp': self.amp_drift_rate,
             'time': self.time_drift_rate,
@@ -505,13 +770,19 @@ class ExpDecayFuncNode(FuncNode):
         self.params_before_calibration = {}
         self.params_after_calibration = {}
 
+    def drift_parameters(self, time=None):
+        if self.nonlinear_drift and time is not None:
+            nonlinear_coeff = self.nonlinear_coeff(time - self.last_calibration)
+        else:
+            nonlinear_coeff = 1.
+        # Same drift as FuncNode.drift_parameters, done in a single compiled pass over the parameters
+        _drift_in_place(self._cur, self._rates, self._biases, self._mins, self._maxs,
+                        self._next_rand(2 * len(self._param_names)), nonlinear_coeff)
+
     def exp_decay(self):
-        amp = self.current_params['amp']
-        time = self.current_params['time']
-        decay_time = self.current_params['decay_time']
-        background = self.current_params['background']
+        amp, time, decay_time, background = self._cur.tolist()
         # Background must be positive in exp_decay. The higher this value, the worse it is
-        return amp * np.exp(-time / decay_time) + background
+        return amp * math.exp(-time / decay_time) + background
 
     def _check_value(self):
         """
@@ -554,7 +825,7 @@ class DependentExpDecayNode(ExpDecayFuncNode):
             setattr(self, key, kwargs.get(key, default))
 
         # Calculate the time parameter based on the decay time. Drifts in time here model drifts in the control
-        self.time = -self.decay_time * np.log(1 - .999)
+        self.time = self.decay_time * _NEG_LOG_999_REMAINDER
 
         self.parameters = [
             'amp',
@@ -566,8 +837,6 @@ class DependentExpDecayNode(ExpDecayFuncNode):
             'time': self.time,
             'decay_time': self.decay_time,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'amp': self.amp_drift_rate,
             'time': self.time_drift_rate,
@@ -591,13 +860,11 @@ class DependentExpDecayNode(ExpDecayFuncNode):
         }
 
     def exp_decay(self):
-        amp = self.current_params['amp']
-        time = self.current_params['time']
-        decay_time = self.current_params['decay_time']
+        amp, time, decay_time = self._cur.tolist()
         background = self.dependent_nodes['background_node'].exp_decay()
         # Background must be positive in exp_decay. The higher this value, the worse it is
 
-        return amp * np.exp(-time / decay_time) + background / 5
+        return amp * math.exp(-time / decay_time) + background / 5
 
 
 class SPAMBackgroundNode(ExpDecayFuncNode):
@@ -631,7 +898,7 @@ class SPAMBackgroundNode(ExpDecayFuncNode):
             setattr(self, key, kwargs.get(key, default))
 
         # Calculate the time parameter based on the decay time. Drifts in time here model drifts in the control
-        self.time = -self.decay_time * np.log(1 - .999)
+        self.time = self.decay_time * _NEG_LOG_999_REMAINDER
 
         self.parameters = [
             'amp',
@@ -645,8 +912,6 @@ class SPAMBackgroundNode(ExpDecayFuncNode):
             'decay_time': self.decay_time,
             'background': self.background,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'amp': self.amp_drift_rate,
             'time': self.time_drift_rate,
@@ -727,8 +992,6 @@ class RabiNode(Sin2FuncNode):
             'time': self.time,
             'delta': self.delta,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'omega': self.omega_drift_rate,
             'time': self.time_drift_rate,
@@ -752,25 +1015,30 @@ class RabiNode(Sin2FuncNode):
         }
 
     def get_rabi_freq(self):
-        omega = self.current_params['omega']
+        omega = self._cur[0]
         return omega
 
     def get_tau(self):
-        time = self.current_params['time']
+        time = self._cur[1]
         return time
 
     def sin2_with_error(self):
-        omega = self.current_params['omega']
-        time = self.current_params['time']
-        delta = self.current_params['delta']
+        omega, time, delta = self._cur.tolist()
         background = self.dependent_nodes[
             'spam_background_node'].get_background()  # Value must be positive, so will be subracted
 
-        return np.sin(omega * time) ** 2 * np.cos(delta) ** 2 - background / 5
+        return _sin2_with_error(omega, time, self._cos2_delta(delta), background / 5)
 
 
 class XGateFreqOnlyNode(FuncNode):
 
+    # Motional mode parameters for ms_gate. These are technically unused, but must be of the correct shape
+    MODE_FREQ = _read_only_array([13849904.48413065, 14128632.55338318, 14355776.36241415,
+                                  14540002.43438146, 14685826.11757425])
+    ETA = _read_only_array([0.1, 0.1, 0.1, 0.1, 0.1])
+    NORMAL_COEFF = _read_only_array(
+        [[-1.04541242e-01], [3.01659288e-01], [-5.37653354e-01], [-6.39532387e-01], [4.47213595e-01]])
+
     def __init__(self, **kwargs):
         # Must have a dependent node to source the Rabi frequency
         assert 'dependent_nodes' in kwargs
@@ -806,8 +1074,6 @@ class XGateFreqOnlyNode(FuncNode):
             'tau': self.tau,
             'spin_phase': self.spin_phase,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'tau': self.tau_drift_rate,
             'spin_phase': self.spin_phase_drift_rate,
@@ -834,28 +1100,18 @@ class XGateFreqOnlyNode(FuncNode):
         # Get the Rabi frequency from the dependent node
         rabi_freq = self.dependent_nodes['rabi_freq_node'].get_rabi_freq()
 
-        tau = self.current_params['tau']
-        spin_phase = self.current_params['spin_phase']
-        # The following are technically unused, but must be of the correct shape
-        mode_freq = np.array([13849904.48413065, 14128632.55338318, 14355776.36241415,
-                              14540002.43438146, 14685826.11757425])
-        eta = np.array([0.1, 0.1, 0.1, 0.1, 0.1])
-        normal_coeff = np.array(
-            [[-1.04541242e-01], [3.01659288e-01], [-5.37653354e-01], [-6.39532387e-01], [4.47213595e-01]])
+        tau, spin_phase = self._cur.tolist()
 
         # Initial state is |-> to catch phase errors
-        init_qubit_state = (qt.fock(2, 1) - qt.fock(2, 0)) / np.sqrt(2)
-        sim = ms_gate.Simulator(mode_freq, eta, normal_coeff, tau, 1, rabi_freq, spin_phase_list=spin_phase)
-        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=init_qubit_state)
+        sim = ms_gate.Simulator(self.MODE_FREQ, self.ETA, self.NORMAL_COEFF, tau, 1, rabi_freq,
+                                spin_phase_list=spin_phase)
+        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=_MINUS_KET_QOBJ)
 
         # Calculate fidelity of the X gate. X|-> = |->
         final_state = sim.final_qubit_state
 
-        minus_state = (qt.fock(2, 0) - qt.fock(2, 1)).unit()
-        # Compute the density matrix of the ideal |-> state
-        rho_ideal = minus_state * minus_state.dag()
-        # Compute fidelity: F = Tr( sqrt( sqrt(rho_ideal) * rho_actual * sqrt(rho_ideal) ) )^2
-        fidelity = qt.fidelity(final_state, rho_ideal)
+        # Compute fidelity with the ideal |-> state
+        fidelity = _minus_state_fidelity(final_state)
 
         return fidelity
 
@@ -868,6 +1124,11 @@ class XGateFreqOnlyNode(FuncNode):
 
 class XGateNode(FuncNode):
 
+    # Motional mode parameters for ms_gate. These are technically unused, but must be of the correct shape
+    MODE_FREQ = _read_only_array([13849904.48413065])
+    ETA = _read_only_array([0.1])
+    NORMAL_COEFF = _read_only_array([[-1.04541242e-01]])
+
     def __init__(self, **kwargs):
         # Must have a dependent node to source the Rabi frequency
         assert 'dependent_nodes' in kwargs
@@ -900,8 +1161,6 @@ class XGateNode(FuncNode):
         self.initial_params = {
             'spin_phase': self.spin_phase,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'spin_phase': self.spin_phase_drift_rate,
         }
@@ -925,25 +1184,18 @@ class XGateNode(FuncNode):
         rabi_freq = self.dependent_nodes['rabi_freq_node'].get_rabi_freq()
         tau = self.dependent_nodes['tau_node'].get_tau()
 
-        spin_phase = self.current_params['spin_phase']
-        # The following are technically unused, but must be of the correct shape
-        mode_freq = np.array([13849904.48413065])
-        eta = np.array([0.1])
-        normal_coeff = np.array([[-1.04541242e-01]])
+        spin_phase, = self._cur.tolist()
 
         # Initial state is |-> to catch phase errors
-        init_qubit_state = (qt.fock(2, 1) - qt.fock(2, 0)) / np.sqrt(2)
-        sim = ms_gate.Simulator(mode_freq, eta, normal_coeff, tau, 1, rabi_freq, spin_phase_list=spin_phase)
-        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=init_qubit_state)
+        sim = ms_gate.Simulator(self.MODE_FREQ, self.ETA, self.NORMAL_COEFF, tau, 1, rabi_freq,
+                                spin_phase_list=spin_phase)
+        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=_MINUS_KET_QOBJ)
 
         # Calculate fidelity of the X gate. X|-> = |->
         final_state = sim.final_qubit_state
 
-        minus_state = (qt.fock(2, 0) - qt.fock(2, 1)).unit()
-        # Compute the density matrix of the ideal |-> state
-        rho_ideal = minus_state * minus_state.dag()
-        # Compute fidelity: F = Tr( sqrt( sqrt(rho_ideal) * rho_actual * sqrt(rho_ideal) ) )^2
-        fidelity = qt.fidelity(final_state, rho_ideal)
+        # Compute fidelity with the ideal |-> state
+        fidelity = _minus_state_fidelity(final_state)
 
         return fidelity
 
@@ -956,6 +1208,11 @@ class XGateNode(FuncNode):
 
 class XGateSimpleNode(FuncNode):
 
+    # Motional mode parameters for ms_gate. These are technically unused, but must be of the correct shape
+    MODE_FREQ = _read_only_array([13849904.48413065])
+    ETA = _read_only_array([0.1])
+    NORMAL_COEFF = _read_only_array([[-1.04541242e-01]])
+
     def parameter_setup(self, **kwargs):
         # Default values
         defaults = {
@@ -972,6 +1229,10 @@ class XGateSimpleNode(FuncNode):
             'spin_phase': 0.,  # laser phase
             'spin_phase_drift_rate': 0.0632 / 50,
             'spin_phase_drift_bias': 0.4,
+
+            # Use the closed-form two-level propagator instead of the ms_gate solve. The pulse is carrier only, so it
+            #   reduces to a single-qubit rotation. Keep False to validate against the full simulation.
+            'analytic_fidelity': False,
         }
 
         # Override defaults with kwargs if provided
@@ -988,8 +1249,6 @@ class XGateSimpleNode(FuncNode):
             'time': self.time,
             'spin_phase': self.spin_phase,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'omega': self.omega_drift_rate,
             'time': self.time_drift_rate,
@@ -1017,28 +1276,19 @@ class XGateSimpleNode(FuncNode):
         self.params_after_calibration = {}
 
     def simulate_X_gate_fidelity(self):
-        omega = self.current_params['omega']
-        time = self.current_params['time']
-        spin_phase = self.current_params['spin_phase']
-
-        # The following are technically unused, but must be of the correct shape
-        mode_freq = np.array([13849904.48413065])
-        eta = np.array([0.1])
-        normal_coeff = np.array([[-1.04541242e-01]])
+        omega, time, spin_phase = self._cur.tolist()
+        if self.analytic_fidelity:
+            return _x_gate_fidelity_analytic(omega, time, spin_phase)
 
         # Initial state is |-> to catch phase errors
-        init_qubit_state = (qt.fock(2, 1) - qt.fock(2, 0)) / np.sqrt(2)
-        sim = ms_gate.Simulator(mode_freq, eta, normal_coeff, time, 1, omega, spin_phase_list=spin_phase)
-        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=init_qubit_state)
+        sim = ms_gate.Simulator(self.MODE_FREQ, self.ETA, self.NORMAL_COEFF, time, 1, omega, spin_phase_list=spin_phase)
+        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=_MINUS_KET_QOBJ)
 
         # Calculate fidelity of the X gate. X|-> = |->
         final_state = sim.final_qubit_state
 
-        minus_state = (qt.fock(2, 0) - qt.fock(2, 1)).unit()
-        # Compute the density matrix of the ideal |-> state
-        rho_ideal = minus_state * minus_state.dag()
-        # Compute fidelity: F = Tr( sqrt( sqrt(rho_ideal) * rho_actual * sqrt(rho_ideal) ) )^2
-        fidelity = qt.fidelity(final_state, rho_ideal)
+        # Compute fidelity with the ideal |-> state
+        fidelity = _minus_state_fidelity(final_state)
 
         return fidelity
 
@@ -1052,6 +1302,11 @@ class XGateSimpleNode(FuncNode):
 class XGateSelfCorrectingeNode(FuncNode):
     """Simplifies a full multi node process by combining everything into this one node"""
 
+    # Motional mode parameters for ms_gate. These are technically unused, but must be of the correct shape
+    MODE_FREQ = _read_only_array([13849904.48413065])
+    ETA = _read_only_array([0.1])
+    NORMAL_COEFF = _read_only_array([[-1.04541242e-01]])
+
     def parameter_setup(self, **kwargs):
         # Default values
         defaults = {
@@ -1084,8 +1339,6 @@ class XGateSelfCorrectingeNode(FuncNode):
             'time': self.time,
             'spin_phase': self.spin_phase,
         }
-        self.current_params = self.initial_params.copy()
-        self.threshold = self.threshold
         self.drift_rates = {
             'omega': self.omega_drift_rate,
             'time': self.time_drift_rate,
@@ -1113,28 +1366,17 @@ class XGateSelfCorrectingeNode(FuncNode):
         self.params_after_calibration = {}
 
     def simulate_X_gate_fidelity(self):
-        omega = self.current_params['omega']
-        time = self.current_params['time']
-        spin_phase = self.current_params['spin_phase']
-
-        # The following are technically unused, but must be of the correct shape
-        mode_freq = np.array([13849904.48413065])
-        eta = np.array([0.1])
-        normal_coeff = np.array([[-1.04541242e-01]])
+        omega, time, spin_phase = self._cur.tolist()
 
         # Initial state is |-> to catch phase errors
-        init_qubit_state = (qt.fock(2, 1) - qt.fock(2, 0)) / np.sqrt(2)
-        sim = ms_gate.Simulator(mode_freq, eta, normal_coeff, time, 1, omega, spin_phase_list=spin_phase)
-        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=init_qubit_state)
+        sim = ms_gate.Simulator(self.MODE_FREQ, self.ETA, self.NORMAL_COEFF, time, 1, omega, spin_phase_list=spin_phase)
+        sim.solve([0], [], sideband=False, carrier=True, init_qubit_state=_MINUS_KET_QOBJ)
 
         # Calculate fidelity of the X gate. X|-> = |->
         final_state = sim.final_qubit_state
 
-        minus_state = (qt.fock(2, 0) - qt.fock(2, 1)).unit()
-        # Compute the density matrix of the ideal |-> state
-        rho_ideal = minus_state * minus_state.dag()
-        # Compute fidelity: F = Tr( sqrt( sqrt(rho_ideal) * rho_actual * sqrt(rho_ideal) ) )^2
-        fidelity = qt.fidelity(final_state, rho_ideal)
+        # Compute fidelity with the ideal |-> state
+        fidelity = _minus_state_fidelity(final_state)
 
         return fidelity
 
@@ -1151,21 +1393,51 @@ class XGateSelfCorrectingeNode(FuncNode):
         else:
             nonlinear_coeff = 1
 
-        for param in self.parameters:
-            # Decide drift direction
-            if np.random.uniform() < self.drift_biases[param]:
-                direction = 1
-            else:
-                direction = -1
-            drift = direction * self.drift_rates[param] * np.random.uniform() * nonlinear_coeff
-            # Ensure that the new parameter is between the max and min values
-            new_param = self.current_params[param] + drift
-            new_param = max(self.parameter_min_values[param], new_param)
-            new_param = min(self.parameter_max_values[param], new_param)
+        n = len(self._param_names)
+        # One batch of draws per step: the first half picks directions, the second half scales the steps
+        draws = self._next_rand(2 * n)
+        # Decide drift direction for every parameter at once. Branchless: True -> +1, False -> -1
+        direction = 2. * (draws[:n] < self._biases) - 1.
+        drift = direction * self._rates * draws[n:] * nonlinear_coeff
+        # Ensure that the new parameters are between the max and min values
+        new_params = np.clip(self._cur + drift, self._mins, self._maxs)
 
-            # If the new_param is equal to the min or the max value, then reset it to the initial value
-            if new_param == self.parameter_min_values[param] or new_param == self.parameter_max_values[param]:
-                new_param = self.initial_params[param]
+        # If a new parameter is equal to the min or the max value, then reset it to the initial value
+        at_bound = (new_params == self._mins) | (new_params == self._maxs)
+        self._cur = np.where(at_bound, self._init, new_params)
 
-            self.current_params[param] = new_param
 
+def seed_rng(seed):
+    """
+    Reseed the random generator shared by all nodes created without their own `seed`, for reproducible simulations.
+    Nodes keep any draws they have already buffered.
+    """
+    _RNG.bit_generator.state = type(_RNG.bit_generator)(seed).state
+
+
+def simulate_failure_parallel(nodes, time=None, executor=None, steps=1):
+    """
+    Advance several nodes with `simulate_failure`, submitting each node to `executor` and waiting for all of them.
+    The heavy work in the X gate nodes (ms_gate / QuTiP solves) happens in compiled code, so a
+    `concurrent.futures.ThreadPoolExecutor` lets independent nodes run concurrently. With no executor, the nodes are
+    advanced serially.
+
+    Nodes only share the module random generator, which is safe to draw from concurrently. A node that reads the
+    parameters of a dependent node during its check may see them either before or after that node's drift for the
+    step; use the serial path if a fixed ordering is needed.
+    :param nodes: Iterable of Nodes to advance
+    :param time: Current simulation time
+    :param executor: concurrent.futures.ThreadPoolExecutor to run the nodes on, or None. Thread pool only: a process
+        pool would advance pickled copies of the nodes and leave the nodes themselves untouched
+    :param steps: Number of time steps to advance each node
+    """
+    if executor is None:
+        for node in nodes:
+            node.simulate_failure(time, steps=steps)
+        return
+
+    assert isinstance(executor, ThreadPoolExecutor), 'Nodes can only be advanced on a ThreadPoolExecutor'
+    futures = [executor.submit(node.simulate_failure, time, steps=steps) for node in nodes]
+    for future in futures:
+        # Re-raises any exception from the node
+        future.result()
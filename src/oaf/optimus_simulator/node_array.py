@@ -0,0 +1,186 @@
+import math
+import numpy as np
+from oaf.optimus_simulator.node import SimpleNode, TrendNode
+from oaf.util import HAS_NUMBA, njit, prange
+
+
+def _optional_float(value):
+    """Check data is stored as NaN until the node has produced a value"""
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def _array_property(array_name, cast):
+    """Node attribute stored at the node's index in one of the arrays of its `node_array`"""
+    def fget(self):
+        return cast(getattr(self.node_array, array_name)[self.node_index])
+
+    def fset(self, value):
+        getattr(self.node_array, array_name)[self.node_index] = value
+
+    return property(fget, fset)
+
+
+@njit(parallel=True, cache=True)
+def _simple_node_step(probs, failed, check_data, failure_magnitude, draws):
+    """
+    One SimpleNode step for every node, in parallel over the nodes. `draws` has shape (2, n): the first row is each
+    node's check data draw, the second picks the magnitude (1 or 2) of a new failure.
+    """
+    for i in prange(probs.size):
+        if failed[i]:
+            continue
+        check_data[i] = draws[0, i]
+        if draws[0, i] < probs[i]:
+            failed[i] = True
+            failure_magnitude[i] = 1 + int(2. * draws[1, i])
+
+
+class ArraySimpleNode(SimpleNode):
+    """
+    SimpleNode whose state lives in a SimpleNodeArray. Behaves like a SimpleNode everywhere except that it does not
+    advance itself: the whole array is advanced at once with `SimpleNodeArray.step`, which the simulator does
+    automatically for any node array its nodes belong to.
+    """
+    failed = _array_property('failed', bool)
+    failure_magnitude = _array_property('failure_magnitude', int)
+    check_data_value = _array_property('check_data', _optional_float)
+    failure_prob = _array_property('probs', float)
+
+    def __init__(self, node_array, node_index, **kwargs):
+        self.node_array = node_array
+        self.node_index = node_index
+        super().__init__(**kwargs)
+
+    def simulate_failure(self, time=None, steps=1):
+        """Advanced by the owning SimpleNodeArray"""
+        pass
+
+
+class SimpleNodeArray:
+    """
+    A population of SimpleNodes stored as arrays, so that every node is advanced with a few vectorized operations per
+    step instead of one Python call per node. The individual nodes are available as `nodes`, and can be passed to the
+    simulator like any other node.
+    """
+
+    def __init__(self, node_kwargs, seed=None):
+        """
+        :param node_kwargs: List of kwargs dicts, one per node, as would be passed to SimpleNode
+        :param seed: Seed for the random generator shared by all nodes in the array
+        """
+        n = len(node_kwargs)
+        self.probs = np.zeros(n)
+        self.failed = np.zeros(n, dtype=bool)
+        self.check_data = np.full(n, np.nan)
+        self.failure_magnitude = np.zeros(n, dtype=np.int8)
+
+        self._rng = np.random.default_rng(seed)
+        # Scratch buffers reused on every step
+        self._draws = np.empty((2, n))
+        self._active = np.empty(n, dtype=bool)
+        self._new_fail = np.empty(n, dtype=bool)
+
+        self.nodes = [ArraySimpleNode(self, i, **kwargs) for i, kwargs in enumerate(node_kwargs)]
+
+    def step(self, steps=1):
+        """Advance all nodes by `steps` timesteps. Same behavior as SimpleNode.simulate_failure for each node."""
+        for _ in range(steps):
+            if self.failed.all():
+                return
+            # Draws come from the array's Generator so that runs are reproducible from its seed
+            self._rng.random(out=self._draws)
+
+            # With numba, the whole step is one compiled parallel loop
+            if HAS_NUMBA:
+                _simple_node_step(self.probs, self.failed, self.check_data, self.failure_magnitude, self._draws)
+                continue
+
+            # Nodes that already failed keep their check data and magnitude
+            np.logical_not(self.failed, out=self._active)
+            np.copyto(self.check_data, self._draws[0], where=self._active)
+            np.less(self._draws[0], self.probs, out=self._new_fail)
+            self._new_fail &= self._active
+            self.failed |= self._new_fail
+
+            # Random magnitude (1 or 2) for the nodes that just failed
+            np.copyto(self.failure_magnitude, 1 + (2. * self._draws[1]).astype(np.int8), where=self._new_fail)
+
+
+class ArrayTrendNode(TrendNode):
+    """
+    TrendNode whose state lives in a TrendNodeArray. Advanced as part of the array with `TrendNodeArray.step`, like
+    ArraySimpleNode.
+    """
+    failed = _array_property('failed', bool)
+    failure_magnitude = _array_property('failure_magnitude', int)
+    check_data_value = _array_property('check_data', float)
+    drift_rate = _array_property('drift_rate', float)
+    noise_std = _array_property('noise_std', float)
+    threshold = _array_property('threshold', float)
+
+    def __init__(self, node_array, node_index, **kwargs):
+        self.node_array = node_array
+        self.node_index = node_index
+        super().__init__(**kwargs)
+
+    def simulate_failure(self, time=None, steps=1):
+        """Advanced by the owning TrendNodeArray"""
+        pass
+
+
+class TrendNodeArray:
+    """
+    A population of TrendNodes stored as arrays and advanced together, one vectorized noise draw per step. The
+    individual nodes are available as `nodes`.
+    """
+
+    def __init__(self, node_kwargs, seed=None):
+        """
+        :param node_kwargs: List of kwargs dicts, one per node, as would be passed to TrendNode
+        :param seed: Seed for the random generator shared by all nodes in the array
+        """
+        n = len(node_kwargs)
+        self.check_data = np.zeros(n)
+        self.drift_rate = np.zeros(n)
+        self.noise_std = np.zeros(n)
+        self.threshold = np.zeros(n)
+        self.failed = np.zeros(n, dtype=bool)
+        self.failure_magnitude = np.zeros(n, dtype=np.int8)
+
+        self._rng = np.random.default_rng(seed)
+        # Scratch buffers reused on every step
+        self._noise = np.empty(n)
+        self._diff = np.empty(n)
+        self._active = np.empty(n, dtype=bool)
+        self._new_fail = np.empty(n, dtype=bool)
+        self._major = np.empty(n, dtype=bool)
+        self._magnitudes = np.empty(n, dtype=np.int8)
+
+        self.nodes = [ArrayTrendNode(self, i, **kwargs) for i, kwargs in enumerate(node_kwargs)]
+
+    def step(self, steps=1):
+        """Advance all nodes by `steps` timesteps. Same behavior as TrendNode.simulate_failure for each node."""
+        for _ in range(steps):
+            np.logical_not(self.failed, out=self._active)
+            if not self._active.any():
+                return
+
+            # Drift and noise, only for nodes that have not failed yet
+            self._rng.standard_normal(out=self._noise)
+            self._noise *= self.noise_std
+            self._noise += self.drift_rate
+            np.add(self.check_data, self._noise, out=self.check_data, where=self._active)
+
+            np.greater(self.check_data, self.threshold, out=self._new_fail)
+            self._new_fail &= self._active
+            if not self._new_fail.any():
+                continue
+            self.failed |= self._new_fail
+
+            # Magnitude 2 if the value is more than one noise std past the threshold, else 1
+            np.subtract(self.check_data, self.threshold, out=self._diff)
+            np.abs(self._diff, out=self._diff)
+            np.greater(self._diff, self.noise_std, out=self._major)
+            np.add(self._major.view(np.int8), 1, out=self._magnitudes)
+            np.copyto(self.failure_magnitude, self._magnitudes, where=self._new_fail)
@@ -0,0 +1,35 @@
+import multiprocessing as mp
+
+from oaf.optimus_simulator.node import seed_rng
+
+
+def _one_world(factory, steps, seed):
+    """Build one simulator from `factory` with the shared node random generator seeded with `seed`, and run it"""
+    seed_rng(seed)
+    simulator = factory()
+    simulator.simulate(steps)
+    return {
+        'seed': seed,
+        'wave_data': simulator.get_wave_data(),
+        'check_data_results': simulator.get_check_data_results(),
+        'ground_truth': simulator.get_ground_truth(),
+        'node_parameter_data': simulator.get_node_parameter_data(),
+    }
+
+
+def run_many(factory, n_worlds, steps, seed0=0, processes=None):
+    """
+    Run independent simulations in a pool of worker processes. Each simulation ("world") is built by calling
+    `factory()` in the worker, after seeding the random generator shared by the nodes with `seed0 + i`, so the results
+    are reproducible and no two workers share random state. Nodes built with their own `seed` (and node arrays) draw
+    from that seed instead, so the factory should leave it unset for the worlds to differ.
+    :param factory: Picklable (module-level) function taking no arguments and returning a QuantumCalibrationSimulator
+    :param n_worlds: Number of simulations to run
+    :param steps: Number of time steps to simulate in each world
+    :param seed0: Seed of the first world
+    :param processes: Number of worker processes. Defaults to the number of CPUs
+    :return: List with one dict per world, in seed order, holding the seed and the simulator's wave data, check data
+        results, ground truth and node parameter data
+    """
+    with mp.Pool(processes) as pool:
+        return pool.starmap(_one_world, [(factory, steps, seed0 + i) for i in range(n_worlds)])
@@ -36,8 +36,6 @@ class RandomlyChangeParamNode(FuncNode):
             'param': self.param,
         }
 
-        self.current_params = self.initial_params.copy()
-
         self.drift_rates = {
             'param': self.param_drift_rate,
         }
@@ -61,14 +59,14 @@ class RandomlyChangeParamNode(FuncNode):
 
     def calibrate(self, time):
         # Save the parameters right before calibration
-        self.params_before_calibration = self.current_params.copy()
+        self.params_before_calibration = self.params_snapshot()
 
         # With some probability, change the parameter value by a large amount
-        if np.random.rand() < self.check_data_failure_rate:
+        if self._rng.random() < self.check_data_failure_rate:
             # Change the parameter value by a large amount
-            self.current_params['param'] += self.param_calibration_drift_amount
+            self.set_param('param', self._cur[0] + self.param_calibration_drift_amount)
 
-        self.params_after_calibration = self.current_params.copy()
+        self.params_after_calibration = self.params_snapshot()
 
         # Perform basic maintenance
         self.failed = False
@@ -77,7 +75,7 @@ class RandomlyChangeParamNode(FuncNode):
 
 
     def get_param(self):
-        return self.current_params['param']
+        return self._cur[0]
 
 
 class RandomlyChangeParamNodeCombinedWithTargetNode(FuncNode):
@@ -116,8 +114,6 @@ class RandomlyChangeParamNodeCombinedWithTargetNode(FuncNode):
             'param': self.param,
         }
 
-        self.current_params = self.initial_params.copy()
-
         self.drift_rates = {
             'param': self.param_drift_rate,
         }
@@ -145,17 +141,17 @@ class RandomlyChangeParamNodeCombinedWithTargetNode(FuncNode):
 
     def calibrate(self, time):
         # Save the parameters right before calibration
-        self.params_before_calibration = self.current_params.copy()
+        self.params_before_calibration = self.params_snapshot()
 
         # With some probability, change the parameter value by a large amount
-        if np.random.rand() < self.check_data_failure_rate:
+        if self._rng.random() < self.check_data_failure_rate:
             # Change the parameter value by a large amount
-            self.current_params['param'] += self.param_calibration_drift_amount
+            self.set_param('param', self._cur[0] + self.param_calibration_drift_amount)
 
         # Calibrate the combined target node
         self.target_node.calibrate(time)
 
-        self.params_after_calibration = self.current_params.copy()
+        self.params_after_calibration = self.params_snapshot()
 
         # Perform basic maintenance
         self.failed = False
@@ -164,4 +160,4 @@ class RandomlyChangeParamNodeCombinedWithTargetNode(FuncNode):
 
 
     def get_param(self):
-        return self.current_params['param']
\ No newline at end of file
+        return self._cur[0]
\ No newline at end of file
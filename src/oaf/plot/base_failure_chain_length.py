@@ -11,12 +11,12 @@ def plot(average_chain_lengths_per_node, filename=None):
     :param nodes: list: A list of nodes in the graph.
     :param average_chain_lengths_per_node: dict: A list of nodes and their average failure chain lengths
     """
-    nodes = list(average_chain_lengths_per_node.keys())
-    average_chain_lengths_per_node = list(average_chain_lengths_per_node.values())
+    # Nodes and their chain lengths from a single pass over the items
+    nodes, chain_lengths = zip(*average_chain_lengths_per_node.items()) if average_chain_lengths_per_node else ((), ())
 
     # Plot the average chain lengths as a bar chart
     fig, ax = plt.subplots(figsize=(8, 6))
-    ax.bar(nodes, average_chain_lengths_per_node, color='skyblue')
+    ax.bar(nodes, chain_lengths, color='skyblue')
     ax.set_ylim(bottom=0)
     ax.set_xlabel('Base Node')
     ax.set_ylabel('Average Failure Chain Length')
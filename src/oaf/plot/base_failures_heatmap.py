@@ -9,26 +9,36 @@ node can then be targeted for more frequent checks and calibrations.
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 import seaborn as sns
 
 from oaf.base_failure import calc_base_failure_proportion
 
+# Above this many nodes, cells are not annotated with their values. Drawing one text artist per cell dominates the plot
+#   time for large graphs, and the numbers are unreadable at that size anyway
+MAX_ANNOTATED_NODES = 20
+
+
+def _node_matrix(nested_dict, labels):
+    """
+    Matrix with [y_idx, x_idx] = nested_dict[labels[x_idx]][labels[y_idx]], and 0 where an entry is missing.
+    The outer keys of a dict of dicts become DataFrame columns and the inner keys its index, giving that layout
+    directly.
+    """
+    return pd.DataFrame(nested_dict, dtype=float).reindex(index=labels, columns=labels).fillna(0.).to_numpy()
+
 
 def plot_base_failure_heatmap(base_failure_proportions, nodes):
     labels = nodes
 
     # Create a 2D matrix for the proportions
-    heatmap_data = np.zeros((len(labels), len(labels)))
-
-    for x_idx, x_label in enumerate(labels):
-        for y_idx, y_label in enumerate(labels):
-            heatmap_data[y_idx, x_idx] = base_failure_proportions.get(x_label, {}).get(y_label, 0.0)
+    heatmap_data = _node_matrix(base_failure_proportions, labels)
 
     # Plot the heatmap using Seaborn
     plt.figure(figsize=(8, 6))
     ax = sns.heatmap(
         heatmap_data,
-        annot=True,  # Annotate cells with data values
+        annot=len(labels) <= MAX_ANNOTATED_NODES,  # Annotate cells with data values
         fmt=".2f",  # Format the annotations to 2 decimal places
         # cmap="viridis",  # Color map
         linewidths=0.5,  # Gridline width
@@ -63,20 +73,16 @@ def plot(base_failure_counts, nodes):
     base_failure_proportions = calc_base_failure_proportion(base_failure_counts)
 
     # Create proportion and count matrices
-    proportions = np.zeros((len(nodes), len(nodes)))
-    counts = np.zeros((len(nodes), len(nodes)))
-
-    for x_idx, x_label in enumerate(nodes):
-        for y_idx, y_label in enumerate(nodes):
-            proportions[y_idx, x_idx] = base_failure_proportions.get(x_label, {}).get(y_label, 0.0)
-            counts[y_idx, x_idx] = base_failure_counts.get(x_label, {}).get(y_label, 0)
+    proportions = _node_matrix(base_failure_proportions, nodes)
+    counts = _node_matrix(base_failure_counts, nodes)
+    annot = len(nodes) <= MAX_ANNOTATED_NODES
 
     # Plot proportions heatmap
     plt.figure(figsize=(12, 6))
     plt.subplot(1, 2, 1)
     sns.heatmap(
         proportions,
-        annot=True,
+        annot=annot,
         fmt=".2f",
         cmap="viridis",
         linewidths=0.5,
@@ -92,7 +98,7 @@ def plot(base_failure_counts, nodes):
     plt.subplot(1, 2, 2)
     sns.heatmap(
         counts,
-        annot=True,
+        annot=annot,
         fmt=".0f",
         cmap="Blues",
         linewidths=0.5,
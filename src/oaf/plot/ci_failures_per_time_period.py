@@ -22,8 +22,8 @@ def plot(ci_per_node, time_period=None, filename=None, failure_type='all'):
     y_positions = np.arange(len(nodes))  # Numeric indices for y-axis
 
     # Extract lower and upper bounds
-    ci_lows = np.array([ci[0] if ci else np.nan for ci in ci_per_node.values()])
-    ci_highs = np.array([ci[1] if ci else np.nan for ci in ci_per_node.values()])
+    bounds = np.array([ci if ci else (np.nan, np.nan) for ci in ci_per_node.values()], dtype=float).reshape(-1, 2)
+    ci_lows, ci_highs = bounds[:, 0], bounds[:, 1]
 
     # Compute error bars
     errors = [(ci_highs - ci_lows) / 2]  # Half CI width
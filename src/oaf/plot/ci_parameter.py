@@ -10,11 +10,11 @@ def plot(ci_per_parameter, filename=None):
     :param ci_per_parameter: dict: A dictionary where keys are parameters and values are tuples of the lower and upper bounds of the CI.
     """
     parameters = list(ci_per_parameter.keys())
-    ci_lows = np.array([ci[0] for ci in ci_per_parameter.values()])
-    ci_highs = np.array([ci[1] for ci in ci_per_parameter.values()])
+    bounds = np.array(list(ci_per_parameter.values()), dtype=float).reshape(-1, 2)
+    ci_lows, ci_highs = bounds[:, 0], bounds[:, 1]
 
     # Compute means and normalized errors
-    means = (ci_lows + ci_highs) / 2  # Mean of each CI
+    means = bounds.mean(axis=1)  # Mean of each CI
     errors = (ci_highs - ci_lows) / 2  # Half CI width
 
     # Normalize: Center all intervals at 0
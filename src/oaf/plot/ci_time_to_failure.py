@@ -25,8 +25,8 @@ def plot(ci_per_node, filename=None, failure_type='all', specific_title='', time
     y_positions = np.arange(len(nodes))  # Numeric indices for y-axis
 
     # Extract lower and upper bounds
-    ci_lows = np.array([ci[0] if ci else np.nan for ci in ci_per_node.values()])
-    ci_highs = np.array([ci[1] if ci else np.nan for ci in ci_per_node.values()])
+    bounds = np.array([ci if ci else (np.nan, np.nan) for ci in ci_per_node.values()], dtype=float).reshape(-1, 2)
+    ci_lows, ci_highs = bounds[:, 0], bounds[:, 1]
 
     # Compute error bars
     errors = [(ci_highs - ci_lows) / 2]  # Half CI width
@@ -52,10 +52,16 @@ def plot(ci_per_node, filename=None, failure_type='all', specific_title='', time
     # Expand x-axis limits slightly for clarity
     ax.set_xlim(np.nanmin(ci_lows) * 0.9, np.nanmax(ci_highs) * 1.1)
 
-    # Annotate actual values
-    for i, (low, high) in enumerate(zip(ci_lows, ci_highs)):
-        ax.text(low, i, f"{low:.3g}", va='center', ha='right', fontsize=10, color="red")
-        ax.text(high, i, f"{high:.3g}", va='center', ha='left', fontsize=10, color="red")
+    # Annotate actual values, formatting all labels up front
+    text_kwargs = dict(va='center', fontsize=10, color="red")
+    low_labels = np.char.mod('%.3g', ci_lows)
+    high_labels = np.char.mod('%.3g', ci_highs)
+    for i in range(len(nodes)):
+        # Nodes without a CI have nothing to label
+        if np.isnan(ci_lows[i]) or np.isnan(ci_highs[i]):
+            continue
+        ax.text(ci_lows[i], i, low_labels[i], ha='right', **text_kwargs)
+        ax.text(ci_highs[i], i, high_labels[i], ha='left', **text_kwargs)
 
     # Improve layout
     plt.xticks(rotation=30)
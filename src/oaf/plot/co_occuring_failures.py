@@ -19,18 +19,17 @@ def plot(cooccurring_data, all_nodes, filename=None):
     # Create a mapping of node names to indices
     node_index = {node: i for i, node in enumerate(all_nodes)}
 
-    # Initialize a square DataFrame for the heatmap
+    # Fill a square matrix with the co-occurrence counts and wrap it in a DataFrame once
     size = len(all_nodes)
-    heatmap = pd.DataFrame(np.zeros((size, size)), index=all_nodes, columns=all_nodes)
-
-    # Populate the heatmap with co-occurrence counts
+    counts = np.zeros((size, size))
     for (node1, node2), count in cooccurring_data.items():
-        heatmap.loc[node1, node2] = count
-        heatmap.loc[node2, node1] = count
+        if node1 in node_index and node2 in node_index:
+            counts[node_index[node1], node_index[node2]] = count
+            counts[node_index[node2], node_index[node1]] = count
+    heatmap = pd.DataFrame(counts, index=all_nodes, columns=all_nodes)
 
-    # Get the Upper Triangle of the co-relation matrix
-    corr = heatmap.corr()
-    matrix = np.triu(corr)
+    # Mask the upper triangle (and diagonal); the matrix is symmetric
+    matrix = np.triu(np.ones((size, size), dtype=bool))
 
     # Plot the heatmap
     plt.figure(figsize=(8, 6))
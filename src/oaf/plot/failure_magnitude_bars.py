@@ -1,4 +1,3 @@
-from collections import defaultdict
 import matplotlib.pyplot as plt
 from matplotlib.ticker import MaxNLocator
 import numpy as np
@@ -20,40 +19,30 @@ def plot(check_data, nodes, include_passes=True, filename=None):
     """
     validate_check_data(check_data)
 
-    # Prepare data for visualization
-    magnitude_0 = defaultdict(int)
-    magnitude_1 = defaultdict(int)
-    magnitude_2 = defaultdict(int)
+    # Prepare data for visualization: node index and failure magnitude of every 'check_data' entry
+    node_idx = {node: i for i, node in enumerate(nodes)}
+    checks = [(node_idx[entry['node']], entry['failure_magnitude']) for entry in check_data
+              if entry['check_type'] == 'check_data' and entry['node'] in node_idx]
+    node_ids = np.fromiter((node_id for node_id, _ in checks), dtype=np.intp, count=len(checks))
+    magnitudes = np.fromiter((magnitude for _, magnitude in checks), dtype=np.int8, count=len(checks))
 
-    for entry in check_data:
-        # Only check entries that are of type 'check_data'
-        if entry['check_type'] != 'check_data':
-            continue
-        node = entry['node']
-        if entry['failure_magnitude'] == 0:
-            magnitude_0[node] += 1
-        if entry['failure_magnitude'] == 1:
-            magnitude_1[node] += 1
-        elif entry['failure_magnitude'] == 2:
-            magnitude_2[node] += 1
-
-    # Get node values
-    mag0_values = [magnitude_0[node] for node in nodes]
-    mag1_values = [magnitude_1[node] for node in nodes]
-    mag2_values = [magnitude_2[node] for node in nodes]
+    # Number of checks of each magnitude per node
+    mag0_values = np.bincount(node_ids[magnitudes == 0], minlength=len(nodes))
+    mag1_values = np.bincount(node_ids[magnitudes == 1], minlength=len(nodes))
+    mag2_values = np.bincount(node_ids[magnitudes == 2], minlength=len(nodes))
 
     # Plotting
     fig, ax = plt.subplots(figsize=(8, 6))
 
     # Create stacked bar chart
     bar_width = 0.6
+    bottom = np.zeros(len(nodes))
     if include_passes:
-        bottom = np.zeros(len(nodes))
         ax.bar(nodes, mag0_values, bottom=bottom, label='Pass', color='lightgreen', width=bar_width)
-        bottom += np.array(mag0_values)
-        ax.bar(nodes, mag1_values, bottom=bottom, label='Magnitude 1 Failures', color='skyblue', width=bar_width)
-        bottom += np.array(mag1_values)
-        ax.bar(nodes, mag2_values, bottom=bottom, label='Magnitude 2 Failures', color='salmon', width=bar_width)
+        bottom += mag0_values
+    ax.bar(nodes, mag1_values, bottom=bottom, label='Magnitude 1 Failures', color='skyblue', width=bar_width)
+    bottom += mag1_values
+    ax.bar(nodes, mag2_values, bottom=bottom, label='Magnitude 2 Failures', color='salmon', width=bar_width)
 
     # Set the y-axis to only use integer ticks
     ax.yaxis.set_major_locator(MaxNLocator(integer=True))
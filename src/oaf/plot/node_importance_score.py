@@ -1,3 +1,5 @@
+from collections import defaultdict
+from operator import itemgetter
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -21,29 +23,25 @@ def calculate_check_scores(wave_data, check_data, graph):
     validate_wave_data(wave_data)
     validate_check_data(check_data)
 
-    wave_data = sorted(wave_data, key=lambda x: x['wave'])
+    wave_data = sorted(wave_data, key=itemgetter('wave'))
 
-    base_failure_data = find_base_failures(wave_data, graph)
-
-    scores = {}
-
-    node_data = {node: {'checks': 0, 'failures': 0, 'failure_magnitudes': [], 'avg_failure_chain_length': 0,
-                        'cofailure_score': 0} for node in graph.nodes}
+    nodes = list(graph.nodes)
+    node_data = {node: {'checks': 0, 'failures': 0, 'failure_magnitude_sum': 0, 'avg_failure_chain_length': 0,
+                        'cofailure_score': 0} for node in nodes}
 
     # Total data_checks and data_check failures
-    for check in check_data:
-        if check['check_type'] != 'check_data':
-            continue
-        node = check['node']
-        node_data[node]['checks'] += 1
-        if check['failure_magnitude'] > 0:
-            node_data[node]['failures'] += 1
-            node_data[node]['failure_magnitudes'].append(check['failure_magnitude'])
+    data_checks = [check for check in check_data if check['check_type'] == 'check_data']
+    for check in data_checks:
+        data = node_data[check['node']]
+        data['checks'] += 1
+        magnitude = check['failure_magnitude']
+        if magnitude > 0:
+            data['failures'] += 1
+            data['failure_magnitude_sum'] += magnitude
 
     # Failure chains
     base_failure_stats = find_base_failures(wave_data, graph)
     avg_failure_chain_lengths = find_mean_failure_chain_length(base_failure_stats, graph)
-    nodes = list(graph.nodes)
     for node in nodes:
         node_data[node]['avg_failure_chain_length'] = avg_failure_chain_lengths[node]
 
@@ -52,41 +50,40 @@ def calculate_check_scores(wave_data, check_data, graph):
     # Calculate the co-occuring failures for each wave
     co_occurring_data = find_co_occurring_failures(wave_data, nodes)
 
-    for node in graph.nodes:
-        cofailure_score = sum(
-            co_occurring_data.get(tuple(sorted((node, other))), 0)
-            for other in graph.nodes if other != node
-        )
-        node_data[node]['cofailure_score'] = cofailure_score
-
-    # Calculate a score for each node
-    for node in graph.nodes:
-        # Success rate and unnecessary checks
-        total_check_count = node_data[node]['checks']
-        failure_count = node_data[node]['failures']
-        success_rate = (total_check_count - failure_count) / max(1, total_check_count)
-        unnecessary_checks = total_check_count - failure_count
-        avg_failure_magnitude = sum(node_data[node]['failure_magnitudes']) / max(1, len(node_data[node]['failure_magnitudes']))
-        downstream_impact = node_data[node]['avg_failure_chain_length']
-        cofailure_score = node_data[node]['cofailure_score']
-
-        # Calculate scores
-        check_more_score = (
-                4. * avg_failure_magnitude
-                + 10 * (1 - success_rate)
-                + 10. * downstream_impact
-                + 3. * cofailure_score
-        )
-        check_less_score = (
-                0.5 * success_rate
-                + 0.2 * (1 / max(1., avg_failure_magnitude))
-                + 0.2 * (1 / max(1, downstream_impact))
-        )
-
-        scores[node] = {
-            'check_more': check_more_score,
-            'check_less': check_less_score
-        }
+    # Every pair's count contributes to both of its nodes. Only pairs of two different graph nodes are counted
+    cofailure_scores = defaultdict(int)
+    for (node1, node2), count in co_occurring_data.items():
+        if node1 != node2 and node1 in node_data and node2 in node_data:
+            cofailure_scores[node1] += count
+            cofailure_scores[node2] += count
+    for node in nodes:
+        node_data[node]['cofailure_score'] = cofailure_scores[node]
+
+    # Calculate the scores of all nodes at once, with one array entry per node
+    checks = np.array([node_data[node]['checks'] for node in nodes], dtype=float)
+    failures = np.array([node_data[node]['failures'] for node in nodes], dtype=float)
+    magnitude_sums = np.array([node_data[node]['failure_magnitude_sum'] for node in nodes], dtype=float)
+    downstream_impact = np.array([node_data[node]['avg_failure_chain_length'] for node in nodes], dtype=float)
+    cofailure_score = np.array([node_data[node]['cofailure_score'] for node in nodes], dtype=float)
+
+    # Success rate and average magnitude of the failures
+    success_rate = (checks - failures) / np.maximum(1, checks)
+    avg_failure_magnitude = magnitude_sums / np.maximum(1, failures)
+
+    check_more_scores = (
+            4. * avg_failure_magnitude
+            + 10 * (1 - success_rate)
+            + 10. * downstream_impact
+            + 3. * cofailure_score
+    )
+    check_less_scores = (
+            0.5 * success_rate
+            + 0.2 * (1 / np.maximum(1., avg_failure_magnitude))
+            + 0.2 * (1 / np.maximum(1, downstream_impact))
+    )
+
+    scores = {node: {'check_more': float(check_more), 'check_less': float(check_less)}
+              for node, check_more, check_less in zip(nodes, check_more_scores, check_less_scores)}
 
     return scores
 
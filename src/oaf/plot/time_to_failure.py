@@ -1,10 +1,18 @@
 from collections import defaultdict
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
 
 from oaf.util import validate_wave_data
 
+# Axes.boxplot takes `orientation` from matplotlib 3.10, which deprecates `vert`
+if tuple(int(part) for part in matplotlib.__version__.split('.')[:2]) >= (3, 10):
+    _HORIZONTAL_BOXPLOT = {'orientation': 'horizontal'}
+else:
+    _HORIZONTAL_BOXPLOT = {'vert': False}
+
 
 def calculate_time_to_failure(wave_data, nodes):
     """
@@ -12,13 +20,15 @@ def calculate_time_to_failure(wave_data, nodes):
 
     :param wave_data: list of dict: List of wave data dicts
     :param nodes: list of str: List of node names
-    :return: dict: {node: [time_to_failure]} where each value is a list of intervals between failures.
+    :return: dict: {node: [time_to_failure]} where each value is a list of intervals between failures. Only nodes in
+        `nodes` are included.
     """
     validate_wave_data(wave_data)
 
     time_to_failure = {node: [] for node in nodes}
-    last_fail_time = {}
 
+    # Bucket the failure waves of each node, in wave order
+    failure_waves = defaultdict(list)
     for entry in wave_data:
         # Skip timed triggers, as they are not failures
         if entry['timed_trigger']:
@@ -26,14 +36,12 @@ def calculate_time_to_failure(wave_data, nodes):
         # Any diagnosis wave root nodes are failures
         # TODO: this is unnecessary
         assert len(entry['root_nodes']) == 1, "Multiple root nodes in a diagnosis wave."
-        node = entry['root_nodes'][0]
-        wave = entry['wave']
+        failure_waves[entry['root_nodes'][0]].append(entry['wave'])
 
-        if node in last_fail_time:
-            # Record the time since the last successful calibration or start
-            time_to_failure[node].append(wave - last_fail_time[node])
-        # Update the last check time to the failure wave
-        last_fail_time[node] = wave
+    # The time to failure is the time between consecutive failures of a node
+    for node, waves in failure_waves.items():
+        if node in time_to_failure:
+            time_to_failure[node] = np.diff(waves).tolist()
 
     return time_to_failure
 
@@ -49,47 +57,36 @@ def plot(time_to_failure, filename=None):
         "Invalid time_to_failure format."
 
 
-    # Prepare data for plotting
-    nodes = []
-    times = []
-    num_failures = {node: len(intervals) for node, intervals in time_to_failure.items()}
-
-    for node, intervals in time_to_failure.items():
-        if intervals:  # Include only nodes with failures in the times list
-            nodes.extend([node] * len(intervals))
-            times.extend(intervals)
-        else:
-            # Add a placeholder entry for nodes without failures
-            nodes.append(node)
-            times.append(None)
-
-    failure_counts = [len(intervals) for time_to_failure in times]
-
-    # Create a DataFrame for Seaborn
-    data = pd.DataFrame({'Node': nodes, 'Time to Failure': times})
+    # Prepare data for plotting: one array of intervals per node. Nodes without failures get an empty box
+    nodes = list(time_to_failure)
+    times = [np.asarray(time_to_failure[node], dtype=float) for node in nodes]
+    num_failures = [len(intervals) for intervals in times]
+    y_positions = np.arange(len(nodes))
 
     # Create side-by-side plots
     fig, axes = plt.subplots(1, 2, figsize=(12, 6), gridspec_kw={'width_ratios': [2, 1]})
 
-    # Plot the box-and-whisker plot
-    sns.boxplot(
-        data=data,
-        y='Node',
-        x='Time to Failure',
-        ax=axes[0],
+    # Plot the box-and-whisker plot, first node at the top
+    axes[0].boxplot(
+        times,
+        positions=y_positions,
+        **_HORIZONTAL_BOXPLOT,
         showmeans=True,
         meanline=True,
         meanprops={"color": "black", "ls": "-", "lw": 1.5}
     )
+    axes[0].set_yticks(y_positions)
+    axes[0].set_yticklabels(nodes)
+    axes[0].invert_yaxis()
     axes[0].set_title('Time to Failure for Nodes')
     axes[0].set_xlabel('Time to Failure (time units)')
     axes[0].set_ylabel('Node')
 
     # Plot the bar graph for failure counts
-    axes[1].barh(num_failures.keys(), num_failures.values(), color='gray', alpha=0.7)
+    axes[1].barh(y_positions, num_failures, color='gray', alpha=0.7)
     axes[1].set_title('Failure Count for Nodes')
     axes[1].set_xlabel('Failure Count')
-    axes[1].set_yticks(range(len(nodes)))
+    axes[1].set_yticks(y_positions)
     axes[1].set_yticklabels(nodes)
     axes[1].set_ylim(axes[0].get_ylim())  # Align Y-axis with the boxplot
 
@@ -4,14 +4,14 @@ import matplotlib.pyplot as plt
 from oaf.data_processing import split_data_by_wave
 from oaf.util import validate_wave_data
 
-def _plot_wave(node_graph, trigger_wave=True, checked_nodes=None, failed_nodes=None, wave_value=None, filename=None):
-    if checked_nodes is None:
-        checked_nodes = []
-    if failed_nodes is None:
-        failed_nodes = []
+def _plot_wave(node_graph, trigger_wave=True, checked_nodes=None, failed_nodes=None, wave_value=None, filename=None,
+               pos=None, ax=None):
+    checked_nodes = set() if checked_nodes is None else set(checked_nodes)
+    failed_nodes = set() if failed_nodes is None else set(failed_nodes)
 
-    # Precompute the layout for consistent positioning
-    pos = nx.spring_layout(node_graph, seed=1)  # Use a fixed seed for reproducibility
+    # Layout for consistent positioning; plot() computes it once and passes it to every wave
+    if pos is None:
+        pos = nx.spring_layout(node_graph, seed=1)  # Use a fixed seed for reproducibility
 
     # Adjust checked color based on trigger status
     if trigger_wave:
@@ -35,12 +35,16 @@ def _plot_wave(node_graph, trigger_wave=True, checked_nodes=None, failed_nodes=N
     else:
         title = f'Diagnosis Wave {wave_value}'
 
-    # Draw the graph with fixed positions
-    plt.figure(figsize=(10, 6))
-    plt.title(title)
+    # Draw the graph with fixed positions, reusing the given axes if any
+    if ax is None:
+        ax = plt.figure(figsize=(10, 6)).gca()
+    else:
+        ax.clear()
+    ax.set_title(title)
     nx.draw(
         node_graph,
         pos,  # Use the fixed layout
+        ax=ax,
         with_labels=True,
         node_color=node_colors,
         node_size=800,
@@ -48,7 +52,7 @@ def _plot_wave(node_graph, trigger_wave=True, checked_nodes=None, failed_nodes=N
     )
 
     if filename is not None:
-        plt.savefig(filename)
+        ax.figure.savefig(filename)
     else:
         plt.show()
 
@@ -71,19 +75,9 @@ def _process_wave(data, graph):
     if not diagnosis_data:
         return trigger_event_data, None
 
-    # Reset sets
-    checked_nodes = set()
-    failed_nodes = set()
-    propagation_edges = set()
-
-    # Diagnosis waves
-    for event in diagnosis_data:
-        # Get all checked nodes
-        checked_nodes.update(event["submitted_nodes"])
-
-        # Get all failed nodes
-        failed_nodes.update(event["root_nodes"])
-        propagation_edges.update((root, node) for root in event["root_nodes"] for node in event["submitted_nodes"])
+    # Diagnosis waves: all checked nodes and all failed nodes
+    checked_nodes = {node for event in diagnosis_data for node in event["submitted_nodes"]}
+    failed_nodes = {node for event in diagnosis_data for node in event["root_nodes"]}
 
     # If a node both checked and failed, failure takes precedence
     checked_nodes -= failed_nodes
@@ -112,17 +106,29 @@ def plot(data: list[list[dict]], node_graph: nx.digraph, filenames: list[list[st
     for wave in data:
         validate_wave_data(wave)
 
-    if filenames is not None:
+    saving = filenames is not None
+    if saving:
         assert 2 * len(data) == len(filenames), "Number of data sets must match number of filenames"
     else:
         filenames = [[None, None]] * len(data)
 
+    # The layout is deterministic, so compute it once for all waves
+    pos = nx.spring_layout(node_graph, seed=1)
+
+    # When saving, draw every wave on one figure instead of creating a figure per plot. Shown figures are closed by
+    # the viewer, so each one still gets its own
+    fig, ax = plt.subplots(figsize=(10, 6)) if saving else (None, None)
+
     # Process and plot each wave
     for i, wave_data in enumerate(data):
         trigger_event_data, diagnostic_wave_data = _process_wave(wave_data, node_graph)
-        _plot_wave(node_graph, trigger_wave=True, filename=filenames[i][0], **trigger_event_data)
+        _plot_wave(node_graph, trigger_wave=True, filename=filenames[i][0], pos=pos, ax=ax, **trigger_event_data)
         if diagnostic_wave_data is not None:
-            _plot_wave(node_graph, trigger_wave=False, filename=filenames[i][1], **diagnostic_wave_data)
+            _plot_wave(node_graph, trigger_wave=False, filename=filenames[i][1], pos=pos, ax=ax,
+                       **diagnostic_wave_data)
+
+    if fig is not None:
+        plt.close(fig)
 
 def prep_data(data):
     """
@@ -1,9 +1,144 @@
+import math
+import os
+from functools import lru_cache, partial
+from itertools import compress
+
 import networkx as nx
+import numpy as np
 from spa.core import spa
 from spa.properties import ThresholdProperty
 from spa.util import min_num_samples
 
 from oaf.data_analysis import count_failures, count_base_failures, time_to_failure, time_to_failure_base
+from oaf.util import njit, prange
+
+# SPA property shared by every CI computation
+_THRESHOLD_PROPERTY = ThresholdProperty()
+
+
+@lru_cache(maxsize=64)
+def _spa_ci(samples, proportion, confidence, **spa_kwargs):
+    """
+    SPA confidence interval of `samples` as a (low, high) tuple, or None if SPA does not find one. `samples` is a
+    tuple so that repeated calls with the same samples, e.g. across CI functions run on the same data, are cached.
+    The cache assumes that spa is deterministic for a given input. It holds the full sample tuples, so it is kept
+    small and can be emptied with `clear_ci_cache`. With an executor, each worker process has its own cache.
+    """
+    spa_result = spa(list(samples), _THRESHOLD_PROPERTY, proportion, confidence, **spa_kwargs)
+    if spa_result.confidence_interval is None:
+        return None
+    return spa_result.confidence_interval.low, spa_result.confidence_interval.high
+
+
+def clear_ci_cache():
+    """Empty the cache of SPA confidence intervals, releasing the sample tuples it holds"""
+    _spa_ci.cache_clear()
+
+
+@njit(cache=True)
+def _binomial_ppf(q, n, p):
+    """Smallest k such that P(X <= k) >= q for X ~ Binomial(n, p)"""
+    log_p = math.log(p)
+    log_q = math.log1p(-p)
+    cdf = 0.
+    for k in range(n + 1):
+        cdf += math.exp(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+                        + k * log_p + (n - k) * log_q)
+        if cdf >= q:
+            return k
+    return n
+
+
+@njit(cache=True)
+def _order_statistic_ranks(lengths, proportion, confidence):
+    """
+    1-based ranks of the lower and upper CI bound for each sample count: the binomial (1 - confidence) / 2 and
+    (1 + confidence) / 2 quantiles. Computed once per distinct count, since rows often share their length.
+    """
+    low_ranks = np.empty(lengths.size, dtype=np.int64)
+    high_ranks = np.empty(lengths.size, dtype=np.int64)
+    tail = (1. - confidence) / 2.
+    last_n = -1
+    low_rank = high_rank = 0
+    for i in range(lengths.size):
+        n = lengths[i]
+        if n != last_n:
+            low_rank = _binomial_ppf(tail, n, proportion)
+            high_rank = _binomial_ppf(1. - tail, n, proportion) + 1
+            last_n = n
+        low_ranks[i] = low_rank
+        high_ranks[i] = high_rank
+    return low_ranks, high_ranks
+
+
+@njit(parallel=True, cache=True)
+def _order_statistic_cis(samples, lengths, low_ranks, high_ranks):
+    """
+    Distribution-free CI for a quantile of each row of `samples`, in parallel over the rows. Row i holds lengths[i]
+    samples followed by padding, and its bounds are the order statistics at low_ranks[i] and high_ranks[i], or NaN
+    when the row has too few samples for them. Each bound is found with a partition instead of sorting the row.
+    """
+    out = np.full((lengths.size, 2), np.nan)
+    for i in prange(lengths.size):
+        n = lengths[i]
+        low, high = low_ranks[i] - 1, high_ranks[i] - 1
+        if low < 0 or high >= n:
+            continue
+        # The partition around `high` leaves the smaller values in front, where the lower bound is selected
+        row = np.partition(samples[i, :n], high)
+        out[i, 1] = row[high]
+        out[i, 0] = np.partition(row[:high + 1], low)[low]
+    return out
+
+
+def _order_statistic_ci_list(samples, proportion, confidence):
+    """Order statistic CI of every sample list, computed in one batched kernel call. None where there is no CI"""
+    lengths = np.fromiter((len(row) for row in samples), dtype=np.int64, count=len(samples))
+    padded = np.zeros((len(samples), lengths.max(initial=0)))
+    for i, row in enumerate(samples):
+        padded[i, :lengths[i]] = row
+    low_ranks, high_ranks = _order_statistic_ranks(lengths, proportion, confidence)
+    bounds = _order_statistic_cis(padded, lengths, low_ranks, high_ranks)
+    return [None if math.isnan(low) else (low, high) for low, high in bounds.tolist()]
+
+
+def _spa_ci_dict(data, proportion, confidence, executor=None, method='spa', **spa_kwargs):
+    """
+    SPA confidence interval for each value in the dict that has enough samples, and None for the others. The CIs are
+    independent, so with an `executor` (e.g. a concurrent.futures.ProcessPoolExecutor) they are computed in parallel.
+    With method='order_statistic', the CIs are instead the distribution-free order statistic CIs of the `proportion`
+    quantile, computed for all values in one compiled call, and the executor is not used.
+    """
+    if method == 'order_statistic' and not 0 < proportion < 1:
+        # The binomial rank quantiles are degenerate at proportion 0 or 1, where the bounds would be the sample extremes
+        raise ValueError(f'Order statistic CIs require 0 < proportion < 1, got proportion={proportion}')
+
+    # Only keys with enough samples get a CI
+    lengths = np.fromiter((len(samples) for samples in data.values()), dtype=np.int64, count=len(data))
+    keys = list(compress(data, lengths >= min_num_samples(proportion, confidence)))
+
+    if method == 'order_statistic':
+        # The samples are copied straight into the kernel's padded array, e.g. from rows of a counts array
+        ci = dict.fromkeys(data)
+        ci.update(zip(keys, _order_statistic_ci_list([data[key] for key in keys], proportion, confidence)))
+        return ci
+    elif method != 'spa':
+        raise ValueError(f'Invalid CI method: {method}')
+
+    # spa takes the samples as tuples, so that they can be cached
+    samples = [tuple(data[key]) for key in keys]
+
+    ci_func = partial(_spa_ci, proportion=proportion, confidence=confidence, **spa_kwargs)
+    if executor is None:
+        results = map(ci_func, samples)
+    else:
+        # Send the samples to the workers in batches, a few per CPU, so the dispatch cost is paid per batch
+        chunksize = max(1, len(samples) // (4 * (os.cpu_count() or 1)))
+        results = executor.map(ci_func, samples, chunksize=chunksize)
+
+    ci = dict.fromkeys(data)
+    ci.update(zip(keys, results))
+    return ci
 
 
 def ci_for_parameter(parameter, proportion, confidence, iteration_limit=1000):
@@ -24,54 +159,50 @@ def ci_for_parameter(parameter, proportion, confidence, iteration_limit=1000):
     # else:
     #     ci = None
     # return ci
-    return spa(parameter, ThresholdProperty(), proportion, confidence)
+    return spa(parameter, _THRESHOLD_PROPERTY, proportion, confidence)
 
 
-def ci_dict(data, proportion, confidence, iteration_limit=1000):
+def ci_dict(data, proportion, confidence, iteration_limit=1000, executor=None, method='spa'):
     """
     Create SPA confidence intervals for each value in the dict
-    """
-    keys = data.keys()
 
+    :param executor: Optional concurrent.futures.Executor used to compute the CIs in parallel. Ignored with
+        method='order_statistic', which computes all CIs in one compiled call
+    :param method: 'spa', or 'order_statistic' for the compiled distribution-free CI of the `proportion` quantile,
+        which requires 0 < proportion < 1
+    """
     # Calculate the CI for each key that has enough samples
-    ci = {}
-    for key in keys:
-        if len(data[key]) >= min_num_samples(proportion, confidence):
-            spa_result = spa(data[key], ThresholdProperty(), proportion, confidence, iteration_limit=iteration_limit)
-            if spa_result.confidence_interval is not None:
-                ci[key] = (spa_result.confidence_interval.low, spa_result.confidence_interval.high)
-            else:
-                ci[key] = None
-        else:
-            ci[key] = None
+    if method != 'spa':
+        return _spa_ci_dict(data, proportion, confidence, method=method)
+    return _spa_ci_dict(data, proportion, confidence, executor=executor, iteration_limit=iteration_limit)
 
-    return ci
+
+# Functions giving the per-node samples for each failure type
+_TIME_TO_FAILURE_FUNCS = {'all': time_to_failure, 'base': time_to_failure_base}
+_FAILURE_COUNT_FUNCS = {'all': count_failures, 'base': count_base_failures}
 
 
-def _ci_time_to_failure_wave_data(failure_type, wave_data, graph, proportion, confidence):
+def _count_func(count_funcs, failure_type):
+    """Function counting the given type of failure"""
+    try:
+        return count_funcs[failure_type]
+    except KeyError:
+        raise ValueError(f'Invalid failure type: {failure_type}') from None
+
+
+def _ci_time_to_failure_wave_data(failure_type, wave_data, graph, proportion, confidence, executor=None,
+                                  method='spa'):
     # Check what type of failure the function is counting
-    if failure_type == 'all':
-        count_func = time_to_failure
-    elif failure_type == 'base':
-        count_func = time_to_failure_base
-    else:
-        raise ValueError(f'Invalid failure type: {failure_type}')
+    count_func = _count_func(_TIME_TO_FAILURE_FUNCS, failure_type)
 
     # Get times to failure for each node
-    times_to_failure = count_func(wave_data, nodes)
+    times_to_failure = count_func(wave_data, graph)
 
     # Calculate the CI for each node that has enough samples
-    ci = {}
-    for node in nodes:
-        if len(times_to_failure[node]) >= min_num_samples(proportion, confidence):
-            ci[node] = spa(times_to_failure[node], ThresholdProperty(), proportion, confidence)
-        else:
-            ci[node] = None
-
-    return ci
+    return _spa_ci_dict(times_to_failure, proportion, confidence, executor=executor, method=method)
 
 
-def ci_time_to_failure_wave_data(wave_data, graph, proportion, confidence):
+def ci_time_to_failure_wave_data(wave_data, graph, proportion, confidence, executor=None, method='spa'):
     """
     Calculate a confidence interval for the time to failure for all failures for each node.
 
@@ -79,12 +210,17 @@ def ci_time_to_failure_wave_data(wave_data, graph, proportion, confidence):
     :param graph: nx.DiGraph: The graph representing node relationships.
     :param proportion: float: Proportion for SPA
     :param confidence: float: Confidence level for the interval.
+    :param executor: Optional concurrent.futures.Executor used to compute the per-node CIs in parallel.
+        Ignored with method='order_statistic'.
+    :param method: 'spa', or 'order_statistic' for the compiled distribution-free CI of the `proportion` quantile,
+        which requires 0 < proportion < 1.
     :return: dict: A dictionary where keys are nodes and values are tuples of the lower and upper bounds of the CI.
     """
-    _ci_time_to_failure_wave_data('all', wave_data, nodes, proportion, confidence)
+    return _ci_time_to_failure_wave_data('all', wave_data, graph, proportion, confidence, executor=executor,
+                                         method=method)
 
 
-def ci_time_to_failure_base_wave_data(wave_data, graph, proportion, confidence):
+def ci_time_to_failure_base_wave_data(wave_data, graph, proportion, confidence, executor=None, method='spa'):
     """
     Calculate a confidence interval for the time to failure for base failures for each node.
 
@@ -92,50 +228,42 @@ def ci_time_to_failure_base_wave_data(wave_data, graph, proportion, confidence):
     :param graph: nx.DiGraph: The graph representing node relationships.
     :param proportion: float: Proportion for SPA
     :param confidence: float: Confidence level for the interval
+    :param executor: Optional concurrent.futures.Executor used to compute the per-node CIs in parallel.
+        Ignored with method='order_statistic'.
+    :param method: 'spa', or 'order_statistic' for the compiled distribution-free CI of the `proportion` quantile,
+        which requires 0 < proportion < 1.
     :return: dict: A dictionary where keys are nodes and values are tuples of the lower and upper bounds of the CI.
     """
-    _ci_time_to_failure_wave_data('base', wave_data, nodes, proportion, confidence)
+    return _ci_time_to_failure_wave_data('base', wave_data, graph, proportion, confidence, executor=executor,
+                                         method=method)
 
 
-def _ci_for_failures_in_time_period(failure_type, list_of_wave_data_lists, graph, proportion, confidence):
-    nodes = graph.nodes
+def _ci_for_failures_in_time_period(failure_type, list_of_wave_data_lists, graph, proportion, confidence, executor=None,
+                                    method='spa'):
+    nodes = list(graph.nodes)
     # Check what type of failure the function is counting
-    if failure_type == 'all':
-        count_func = count_failures
-    elif failure_type == 'base':
-        count_func = count_base_failures
-    else:
-        raise ValueError(f'Invalid failure type: {failure_type}')
+    count_func = _count_func(_FAILURE_COUNT_FUNCS, failure_type)
 
     # Ensure there are enough samples for SPA
-    assert len(list_of_wave_data_lists) >= min_num_samples(proportion, confidence), \
+    min_samples = min_num_samples(proportion, confidence)
+    assert len(list_of_wave_data_lists) >= min_samples, \
         (f'Given proportion={proportion} and confidence={confidence}, '
-         f'SPA requires at least {min_num_samples(proportion, confidence)} samples.')
+         f'SPA requires at least {min_samples} samples.')
 
     # Count the number of failures per node for each time period
-    node_failures = {node: [] for node in nodes}
-    for time_period in list_of_wave_data_lists:
-        node_failures_in_wave = count_func(time_period, graph)
-        for node in nodes:
-            node_failures[node].append(node_failures_in_wave[node])
+    # Fill one contiguous row of counts per time period, then transpose so each node's samples are one contiguous row.
+    # The count functions return the counts as arrays in graph node order
+    period_counts = np.empty((len(list_of_wave_data_lists), len(nodes)), dtype=np.int64)
+    for j, time_period in enumerate(list_of_wave_data_lists):
+        period_counts[j] = count_func(time_period, graph, as_array=True)
+    counts = np.ascontiguousarray(period_counts.T)
+    node_failures = dict(zip(nodes, counts))
 
     # Calculate the CI for each node
-    ci = {}
-
-    for node in nodes:
-        if len(node_failures[node]) >= min_num_samples(proportion, confidence):
-            spa_result = spa(node_failures[node], ThresholdProperty(), proportion, confidence)
-            if spa_result.confidence_interval is None:
-                ci[node] = None
-            else:
-                ci[node] = (spa_result.confidence_interval.low, spa_result.confidence_interval.high)
-        else:
-            ci[node] = None
-
-    return ci
+    return _spa_ci_dict(node_failures, proportion, confidence, executor=executor, method=method)
 
 
-def ci_failures_per_time_period(list_of_wave_data_list, graph, proportion, confidence):
+def ci_failures_per_time_period(list_of_wave_data_list, graph, proportion, confidence, executor=None, method='spa'):
     """
     Calculate a confidence interval for the number of failures per node in a given time period.
     This is for all failures, not just base failures.
@@ -144,12 +272,17 @@ def ci_failures_per_time_period(list_of_wave_data_list, graph, proportion, confi
     :param graph: nx.Digraph: The graph representing node relationships.
     :param proportion: float: Proportion for SPA
     :param confidence: float: Confidence level for the interval.
+    :param executor: Optional concurrent.futures.Executor used to compute the per-node CIs in parallel.
+        Ignored with method='order_statistic'.
+    :param method: 'spa', or 'order_statistic' for the compiled distribution-free CI of the `proportion` quantile,
+        which requires 0 < proportion < 1.
     :return: dict: A dictionary where keys are nodes and values are tuples of the lower and upper bounds of the CI.
     """
-    return _ci_for_failures_in_time_period('all', list_of_wave_data_list, graph, proportion, confidence)
+    return _ci_for_failures_in_time_period('all', list_of_wave_data_list, graph, proportion, confidence,
+                                           executor=executor, method=method)
 
 
-def ci_failures_base_per_time_period(node_failure_counts, graph, proportion, confidence):
+def ci_failures_base_per_time_period(node_failure_counts, graph, proportion, confidence, executor=None, method='spa'):
     """
     Calculate a confidence interval for the number of base failures per node in a given time period.
 
@@ -157,5 +290,10 @@ def ci_failures_base_per_time_period(node_failure_counts, graph, proportion, con
     :param graph: nx.Digraph: The graph representing node relationships.
     :param proportion: float: Proportion for SPA
     :param confidence: float: Confidence level for the interval.
+    :param executor: Optional concurrent.futures.Executor used to compute the per-node CIs in parallel.
+        Ignored with method='order_statistic'.
+    :param method: 'spa', or 'order_statistic' for the compiled distribution-free CI of the `proportion` quantile,
+        which requires 0 < proportion < 1.
     """
-    return _ci_for_failures_in_time_period('base', node_failure_counts, graph, proportion, confidence)
+    return _ci_for_failures_in_time_period('base', node_failure_counts, graph, proportion, confidence,
+                                           executor=executor, method=method)
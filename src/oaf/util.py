@@ -1,13 +1,31 @@
+from operator import itemgetter
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    # numba is optional. Without it, jitted functions run as plain Python
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
 def validate_wave_data(data):
     """
     Assert that the wave data is correctly formatted.
     Expected format: list of dict with keys 'wave', 'timed_trigger', 'root_nodes', 'submitted_nodes'.
     """
+    # One pass: the key checks short-circuit before the type checks read the values
     assert all('wave' in entry and 'timed_trigger' in entry and 'root_nodes' in entry and 'submitted_nodes' in entry
-                for entry in data), "Invalid wave_data format."
-    assert all(isinstance(entry['wave'], float) and isinstance(entry['timed_trigger'], bool)
-                and isinstance(entry['root_nodes'], list) and isinstance(entry['submitted_nodes'], list)
-                for entry in data), "Invalid wave_data format."
+               and isinstance(entry['wave'], float) and isinstance(entry['timed_trigger'], bool)
+               and isinstance(entry['root_nodes'], list) and isinstance(entry['submitted_nodes'], list)
+               for entry in data), "Invalid wave_data format."
 
 
 def validate_check_data(data):
@@ -15,67 +33,73 @@ def validate_check_data(data):
     Assert that the check data is correctly formatted.
     Expected format: list of dict with keys 'node', 'check_type', 'wave', 'failure_magnitude'.
     """
+    # One pass: the key checks short-circuit before the type checks read the values
     assert all('node' in entry and 'check_type' in entry and 'wave' in entry and 'failure_magnitude' in entry
-                for entry in data), "Invalid check_data format."
-    assert all(isinstance(entry['node'], str) and isinstance(entry['check_type'], str) and isinstance(entry['wave'], float)
-                and isinstance(entry['failure_magnitude'], int) for entry in data), "Invalid check_data format."
+               and isinstance(entry['node'], str) and isinstance(entry['check_type'], str)
+               and isinstance(entry['wave'], float) and isinstance(entry['failure_magnitude'], int)
+               for entry in data), "Invalid check_data format."
 
 
-def split_data_by_wave(wave_data: list[dict]):
+def split_data_by_wave(wave_data: list[dict], already_validated=False):
     """
     Sort and split simulation data into sublists where each list begins with a timed_trigger=True entry.
     If the first entry is not timed_trigger=True, it will be ignored.
 
     :param wave_data: The raw simulation data.
+    :param already_validated: Skip validating wave_data, for callers that have just validated it.
     :return: Sorted and split simulation data.
     """
-    validate_wave_data(wave_data)
+    if not already_validated:
+        validate_wave_data(wave_data)
 
-    #  Sort the by the 'wave' value
-    sorted_data = sorted(wave_data, key=lambda x: x['wave'])
+    if not wave_data:
+        return []
 
-    # Split into sublists based on 'timed_trigger=True'
-    split_data = []
-    current_list = []
+    # Sort by the 'wave' value, keeping the input order of entries in the same wave
+    n = len(wave_data)
+    waves = np.fromiter((entry['wave'] for entry in wave_data), dtype=np.float64, count=n)
+    timed_triggers = np.fromiter((entry['timed_trigger'] for entry in wave_data), dtype=bool, count=n)
+    order = np.argsort(waves, kind='stable')
 
-    for entry in sorted_data:
-        if entry['timed_trigger']:
-            # If a new propagation starts, save the current list and start a new one
-            if current_list:
-                split_data.append(current_list)
-            current_list = [entry]  # Start a new list with this entry
-        else:
-            current_list.append(entry)
+    # Split into sublists based on 'timed_trigger=True'. Each timed trigger after the first entry starts a new sublist
+    split_points = np.flatnonzero(timed_triggers[order][1:]) + 1
+    return [[wave_data[i] for i in group.tolist()] for group in np.split(order, split_points)]
 
-    # Append the last propagation step if not empty
-    if current_list:
-        split_data.append(current_list)
 
-    return split_data
-
-
-def organize_check_data_by_wave(wave_data, check_data):
+def organize_check_data_by_wave(wave_data, check_data, sorted_triggers=None, already_validated=False):
     """
     Organize the check_data results by wave.
 
     :param wave_data: list of dict: The raw simulation data.
     :param check_data: list of dict: The check_data results.
+    :param sorted_triggers: list of dict: Optional timed trigger entries of wave_data, already sorted by wave. Callers
+      that have run split_data_by_wave can pass the first entry of each sublist that starts with a timed trigger, to
+      skip sorting the wave data again.
+    :param already_validated: Skip validating wave_data and check_data, for callers that have already validated them.
     :return: dict: A dictionary where keys are wave numbers and values are the check_data results for that wave.
     """
-    validate_wave_data(wave_data)
-    validate_check_data(check_data)
-
-    # Remove all data that is not a timed trigger
-    wave_data = [entry for entry in wave_data if entry['timed_trigger']]
-
-    # Sort by the 'wave' value
-    sorted_sim_data = sorted(wave_data, key=lambda x: x['wave'])
+    if not already_validated:
+        validate_wave_data(wave_data)
+        validate_check_data(check_data)
+
+    # Keep only the timed triggers, sorted by the 'wave' value
+    if sorted_triggers is None:
+        sorted_sim_data = sorted((entry for entry in wave_data if entry['timed_trigger']), key=itemgetter('wave'))
+    else:
+        sorted_sim_data = sorted_triggers
+
+    # Find the wave bucket of each check_data result, -1 for results before the first wave. A stable sort by bucket
+    # groups the results while keeping their input order within each bucket
+    boundaries = [entry['wave'] for entry in sorted_sim_data] + [float('inf')]
+    check_waves = np.fromiter((result['wave'] for result in check_data), dtype=np.float64, count=len(check_data))
+    buckets = np.searchsorted(boundaries, check_waves, side='right') - 1
+    order = np.argsort(buckets, kind='stable')
+    starts = np.searchsorted(buckets[order], np.arange(len(boundaries)), side='left').tolist()
+    order = order.tolist()
 
     # Place all check_data results into the appropriate wave bucket
     organized_results = {}
     for i in range(len(sorted_sim_data)):
-        low = sorted_sim_data[i]['wave']
-        high = sorted_sim_data[i + 1]['wave'] if i + 1 < len(sorted_sim_data) else float('inf')
-        organized_results[low] = [result for result in check_data if low <= result['wave'] < high]
+        organized_results[boundaries[i]] = [check_data[j] for j in order[starts[i]:starts[i + 1]]]
 
     return organized_results
\ No newline at end of file